@@ -27,6 +27,11 @@ _LOGGER = logging.getLogger(__name__)
 # Configuration schema - PV Optimizer uses config flow exclusively
 CONFIG_SCHEMA = cv.empty_config_schema(DOMAIN)
 
+# Platforms per entry type
+SERVICE_PLATFORMS = ["sensor"]
+# All devices have sensors, switches, binary_sensors, buttons and number controls
+DEVICE_PLATFORMS = ["sensor", "switch", "binary_sensor", "button", "number"]
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """
@@ -55,7 +60,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
     entry_type = entry.data.get("entry_type")
     
-    _LOGGER.debug(f"Setting up entry: {entry.title} (type={entry_type})")
+    _LOGGER.debug("Setting up entry: %s (type=%s)", entry.title, entry_type)
     
     if entry_type == "service":
         return await _async_setup_service_entry(hass, entry)
@@ -82,13 +87,13 @@ async def _async_setup_service_entry(hass: HomeAssistant, entry: ConfigEntry) ->
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
     # Setup sensor platform for global sensors
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
+    await hass.config_entries.async_forward_entry_setups(entry, SERVICE_PLATFORMS)
     
     # Create service device in device registry
     device_reg = dr.async_get(hass)
     device_reg.async_get_or_create(
         config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, "service")},
+        identifiers={coordinator.device_identifier},
         name="PV Optimizer",
         manufacturer="PV Optimizer",
         model="Service",
@@ -122,7 +127,7 @@ async def _async_setup_device_entry(hass: HomeAssistant, entry: ConfigEntry) ->
     device_config = entry.data.get("device_config", {})
     device_name = device_config.get("name", "Unknown")
     
-    _LOGGER.info(f"Setting up PV Optimizer Device: {device_name}")
+    _LOGGER.info("Setting up PV Optimizer Device: %s", device_name)
     
     # Create device coordinator
     coordinator = DeviceCoordinator(hass, entry)
@@ -135,10 +140,10 @@ async def _async_setup_device_entry(hass: HomeAssistant, entry: ConfigEntry) ->
     service_coordinator = hass.data[DOMAIN].get("service")
     if service_coordinator:
         service_coordinator.register_device_coordinator(coordinator)
-        _LOGGER.info(f"Registered device coordinator: {device_name}")
+        _LOGGER.info("Registered device coordinator: %s", device_name)
     else:
         # Service coordinator not ready yet - schedule delayed registration
-        _LOGGER.warning(f"Service coordinator not found when setting up device: {device_name}, will retry")
+        _LOGGER.warning("Service coordinator not found when setting up device: %s, will retry", device_name)
         
         async def _delayed_registration():
             """Retry registration after service coordinator is ready."""
@@ -148,36 +153,39 @@ async def _async_setup_device_entry(hass: HomeAssistant, entry: ConfigEntry) ->
                 service_coordinator = hass.data[DOMAIN].get("service")
                 if service_coordinator:
                     service_coordinator.register_device_coordinator(coordinator)
-                    _LOGGER.info(f"Registered device coordinator (delayed): {device_name}")
+                    _LOGGER.info("Registered device coordinator (delayed): %s", device_name)
                     return
-            _LOGGER.error(f"Failed to register device coordinator after retries: {device_name}")
+            _LOGGER.error("Failed to register device coordinator after retries: %s", device_name)
         
         # Schedule delayed registration
         hass.async_create_task(_delayed_registration())
     
     # Create device in device registry FIRST (before platforms)
-    from .const import normalize_device_name
-    
+    # Reuse the identifier the coordinator already built instead of re-normalizing
     device_type = device_config.get("type")
-    normalized_name = normalize_device_name(device_name)
+    identifiers = {coordinator.device_identifier}
+    registry_name = f"PVO {device_name}"
+    registry_model = f"{device_type.capitalize()} Device" if device_type else "Unknown Device"
     device_reg = dr.async_get(hass)
-    device_reg.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, f"{entry.entry_id}_{normalized_name}")},
-        name=f"PVO {device_name}",
-        manufacturer="PV Optimizer",
-        model=f"{device_type.capitalize()} Device" if device_type else "Unknown Device",
-    )
-    
-    # Setup platforms based on device type (AFTER device exists)
-    platforms = ["sensor", "switch", "binary_sensor", "button"]  # All devices have sensors, switches, binary_sensors, and buttons
-    
-    if device_type == "switch":
-        platforms.append("number")  # Switch devices also have number controls
-    elif device_type == "numeric":
-        platforms.append("number")  # Numeric devices also have number controls
-    
-    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+    # Skip the registry write on no-op reloads where nothing changed
+    existing = device_reg.async_get_device(identifiers=identifiers)
+    if (
+        existing is None
+        or existing.name != registry_name
+        or existing.model != registry_model
+        or entry.entry_id not in existing.config_entries
+    ):
+        device_reg.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers=identifiers,
+            name=registry_name,
+            manufacturer="PV Optimizer",
+            model=registry_model,
+        )
+    
+    # Setup platforms (AFTER device exists)
+    await hass.config_entries.async_forward_entry_setups(entry, DEVICE_PLATFORMS)
     
     # Initial refresh
     await coordinator.async_refresh()
@@ -186,7 +194,7 @@ async def _async_setup_device_entry(hass: HomeAssistant, entry: ConfigEntry) ->
     # Device config changes are handled in-memory by the coordinator
     # Only service entries need to reload on config changes
     
-    _LOGGER.info(f"PV Optimizer Device setup complete: {device_name}")
+    _LOGGER.info("PV Optimizer Device setup complete: %s", device_name)
     return True
 
 
@@ -198,7 +206,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
     entry_type = entry.data.get("entry_type")
     
-    _LOGGER.debug(f"Unloading entry: {entry.title} (type={entry_type})")
+    _LOGGER.debug("Unloading entry: %s (type=%s)", entry.title, entry_type)
     
     if entry_type == "service":
         # Unload service entry
@@ -210,27 +218,24 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if history_tracker:
             await history_tracker.async_stop()
         
-        unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
+        unload_ok = await hass.config_entries.async_unload_platforms(entry, SERVICE_PLATFORMS)
         return unload_ok
     
     else:
         # Unload device entry
         device_config = entry.data.get("device_config", {})
-        device_type = device_config.get("type")
         device_name = device_config.get("name", "Unknown")
         
-        platforms = ["sensor", "binary_sensor", "button"]
-        if device_type == "switch":
-            platforms.extend(["switch", "number"])
-        elif device_type == "numeric":
-            platforms.extend(["number"])
-        
-        unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
+        # Same list as in setup - a numeric device's switch platform was
+        # previously never unloaded
+        unload_ok = await hass.config_entries.async_unload_platforms(entry, DEVICE_PLATFORMS)
         
         if unload_ok:
             # Unregister from service coordinator
             coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
             if coordinator:
+                # Don't drop a debounced config write still in flight
+                coordinator.async_flush_config()
                 service_coordinator = hass.data[DOMAIN].get("service")
                 if service_coordinator:
                     service_coordinator.unregister_device_coordinator(device_name)
@@ -22,7 +22,6 @@ from homeassistant.helpers.entity import EntityCategory
 from .const import (
     DOMAIN,
     ATTR_IS_LOCKED,
-    normalize_device_name,
 )
 from .coordinators import DeviceCoordinator
 
@@ -69,21 +68,16 @@ class DeviceLockedBinarySensor(CoordinatorEntity, BinarySensorEntity):
     def __init__(self, coordinator: DeviceCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_is_locked"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}is_locked"
         
         # Link to device
-        device_name = coordinator.device_name
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
+        self._attr_device_info = coordinator.device_info
     
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
-        if self.coordinator.data:
-            return self.coordinator.data.get(ATTR_IS_LOCKED, False)
-        return False
+        data = self.coordinator.data
+        return data.get(ATTR_IS_LOCKED, False) if data else False
     
     @property
     def icon(self) -> str:
@@ -101,21 +95,16 @@ class DeviceTimingLockBinarySensor(CoordinatorEntity, BinarySensorEntity):
     def __init__(self, coordinator: DeviceCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_timing_lock"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}timing_lock"
         
         # Link to device
-        device_name = coordinator.device_name
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
+        self._attr_device_info = coordinator.device_info
     
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("is_locked_timing", False)
-        return False
+        data = self.coordinator.data
+        return data.get("is_locked_timing", False) if data else False
     
     @property
     def icon(self) -> str:
@@ -133,21 +122,16 @@ class DeviceManualLockBinarySensor(CoordinatorEntity, BinarySensorEntity):
     def __init__(self, coordinator: DeviceCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_manual_lock"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}manual_lock"
         
         # Link to device
-        device_name = coordinator.device_name
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
+        self._attr_device_info = coordinator.device_info
     
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("is_locked_manual", False)
-        return False
+        data = self.coordinator.data
+        return data.get("is_locked_manual", False) if data else False
     
     @property
     def icon(self) -> str:
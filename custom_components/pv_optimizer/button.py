@@ -14,7 +14,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import EntityCategory
 
-from .const import DOMAIN, normalize_device_name
+from .const import DOMAIN
 from .coordinators import DeviceCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -44,14 +44,10 @@ class DeviceResetButton(CoordinatorEntity, ButtonEntity):
     def __init__(self, coordinator: DeviceCoordinator) -> None:
         """Initialize the button."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_reset_target_state"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}reset_target_state"
         
         # Link to device
-        device_name = coordinator.device_name
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
+        self._attr_device_info = coordinator.device_info
 
     async def async_press(self) -> None:
         """Handle the button press."""
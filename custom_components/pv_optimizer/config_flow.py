@@ -341,6 +341,27 @@ class PVOptimizerOptionsFlow(config_entries.OptionsFlow):
         """Initialize options flow."""
         self.config_entry = config_entry
 
+    def _get_device_config(self) -> Dict[str, Any]:
+        """Return a copy of the current device config to edit."""
+        # Prefer the running coordinator's config - it may hold entity changes
+        # (e.g. a slider) whose debounced config entry write is still pending
+        coordinator = self.hass.data[DOMAIN].get(self.config_entry.entry_id)
+        if coordinator:
+            return dict(coordinator.device_config)
+        return dict(self.config_entry.data.get("device_config", {}))
+
+    def _save_device_config(self, device_config: Dict[str, Any]) -> None:
+        """Persist an edited device config with a single config entry write."""
+        coordinator = self.hass.data[DOMAIN].get(self.config_entry.entry_id)
+        if coordinator:
+            # Also supersedes any pending debounced write of the coordinator
+            coordinator.async_set_device_config(device_config)
+        else:
+            self.hass.config_entries.async_update_entry(
+                self.config_entry,
+                data={**self.config_entry.data, "device_config": device_config},
+            )
+
     async def async_step_init(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
         """Manage the options."""
         entry_type = self.config_entry.data.get("entry_type")
@@ -392,9 +413,10 @@ class PVOptimizerOptionsFlow(config_entries.OptionsFlow):
         """Handle global configuration options."""
         if user_input is not None:
             # Update global config
-            new_data = dict(self.config_entry.data)
-            new_data["global"] = user_input
-            self.hass.config_entries.async_update_entry(self.config_entry, data=new_data)
+            self.hass.config_entries.async_update_entry(
+                self.config_entry,
+                data={**self.config_entry.data, "global": user_input},
+            )
             return self.async_create_entry(title="", data={})
 
         # Get current global config
@@ -437,8 +459,7 @@ class PVOptimizerOptionsFlow(config_entries.OptionsFlow):
         """Handle device configuration options."""
         if user_input is not None:
             # Update device config
-            new_data = dict(self.config_entry.data)
-            device_config = dict(new_data.get("device_config", {}))
+            device_config = self._get_device_config()
             # Update only the editable fields
             device_config.update({
                 CONF_PRIORITY: user_input[CONF_PRIORITY],
@@ -450,18 +471,9 @@ class PVOptimizerOptionsFlow(config_entries.OptionsFlow):
                 CONF_MEASURED_POWER_ENTITY_ID: user_input.get(CONF_MEASURED_POWER_ENTITY_ID),
                 CONF_POWER_THRESHOLD: user_input.get(CONF_POWER_THRESHOLD, 100),
             })
-            new_data["device_config"] = device_config
             
-            # Update entry data without triggering reload
-            self.hass.config_entries.async_update_entry(
-                self.config_entry, 
-                data=new_data,
-            )
-            
-            # Update the coordinator's device_config directly
-            coordinator = self.hass.data[DOMAIN].get(self.config_entry.entry_id)
-            if coordinator:
-                coordinator.device_config = device_config
+            # Update entry data (without triggering reload) and the coordinator
+            self._save_device_config(device_config)
             
             return self.async_create_entry(title="", data={})
 
@@ -619,8 +631,7 @@ class PVOptimizerOptionsFlow(config_entries.OptionsFlow):
         """Add a new numeric target."""
         if user_input is not None:
             # Add target to config
-            new_data = dict(self.config_entry.data)
-            device_config = dict(new_data.get("device_config", {}))
+            device_config = self._get_device_config()
             targets = list(device_config.get(CONF_NUMERIC_TARGETS, []))
             targets.append({
                 CONF_NUMERIC_ENTITY_ID: user_input[CONF_NUMERIC_ENTITY_ID],
@@ -628,14 +639,7 @@ class PVOptimizerOptionsFlow(config_entries.OptionsFlow):
                 CONF_DEACTIVATED_VALUE: user_input[CONF_DEACTIVATED_VALUE],
             })
             device_config[CONF_NUMERIC_TARGETS] = targets
-            new_data["device_config"] = device_config
-            
-            self.hass.config_entries.async_update_entry(self.config_entry, data=new_data)
-            
-            # Update coordinator
-            coordinator = self.hass.data[DOMAIN].get(self.config_entry.entry_id)
-            if coordinator:
-                coordinator.device_config = device_config
+            self._save_device_config(device_config)
             
             return await self.async_step_manage_targets()
         
@@ -670,8 +674,7 @@ class PVOptimizerOptionsFlow(config_entries.OptionsFlow):
         
         if user_input is not None:
             # Update target
-            new_data = dict(self.config_entry.data)
-            device_config = dict(new_data.get("device_config", {}))
+            device_config = self._get_device_config()
             targets = list(device_config.get(CONF_NUMERIC_TARGETS, []))
             targets[index] = {
                 CONF_NUMERIC_ENTITY_ID: user_input[CONF_NUMERIC_ENTITY_ID],
@@ -679,14 +682,7 @@ class PVOptimizerOptionsFlow(config_entries.OptionsFlow):
                 CONF_DEACTIVATED_VALUE: user_input[CONF_DEACTIVATED_VALUE],
             }
             device_config[CONF_NUMERIC_TARGETS] = targets
-            new_data["device_config"] = device_config
-            
-            self.hass.config_entries.async_update_entry(self.config_entry, data=new_data)
-            
-            # Update coordinator
-            coordinator = self.hass.data[DOMAIN].get(self.config_entry.entry_id)
-            if coordinator:
-                coordinator.device_config = device_config
+            self._save_device_config(device_config)
             
             return await self.async_step_manage_targets()
         
@@ -724,20 +720,12 @@ class PVOptimizerOptionsFlow(config_entries.OptionsFlow):
     async def async_step_confirm_delete_target(self, index: int) -> FlowResult:
         """Confirm deletion of a target."""
         # Delete target
-        new_data = dict(self.config_entry.data)
-        device_config = dict(new_data.get("device_config", {}))
+        device_config = self._get_device_config()
         targets = list(device_config.get(CONF_NUMERIC_TARGETS, []))
         
         if index < len(targets):
             targets.pop(index)
             device_config[CONF_NUMERIC_TARGETS] = targets
-            new_data["device_config"] = device_config
-            
-            self.hass.config_entries.async_update_entry(self.config_entry, data=new_data)
-            
-            # Update coordinator
-            coordinator = self.hass.data[DOMAIN].get(self.config_entry.entry_id)
-            if coordinator:
-                coordinator.device_config = device_config
+            self._save_device_config(device_config)
         
         return await self.async_step_manage_targets()
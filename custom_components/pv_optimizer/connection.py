@@ -24,14 +24,6 @@ from .coordinators import ServiceCoordinator, DeviceCoordinator
 _LOGGER = logging.getLogger(__name__)
 
 
-def _get_service_entry(hass):
-    """Get the service config entry if it exists."""
-    for entry in hass.config_entries.async_entries(DOMAIN):
-        if entry.data.get("entry_type") == "service":
-            return entry
-    return None
-
-
 async def async_setup_connection(hass):
     """Set up WebSocket API handlers for PV Optimizer."""
     
@@ -68,25 +60,19 @@ async def async_setup_connection(hass):
             integration = await async_get_integration(hass, DOMAIN)
             version = integration.version
 
-            # Build response data structure
+            # Build response data structure (config and state of every device)
             response_data = {
                 "version": version,
                 "global_config": service_coordinator.global_config,
-                "devices": [],
+                "devices": [
+                    {
+                        "config": device_coordinator.device_config,
+                        "state": device_coordinator.data or {},
+                    }
+                    for device_coordinator in service_coordinator.device_coordinators.values()
+                ],
             }
 
-            # Iterate through all device coordinators
-            for device_name, device_coordinator in service_coordinator.device_coordinators.items():
-                # Get device config and state
-                device_config = device_coordinator.device_config
-                device_state = device_coordinator.data if device_coordinator.data else {}
-                
-                # Add device data to response
-                response_data["devices"].append({
-                    "config": device_config,
-                    "state": device_state,
-                })
-
             # Get optimizer statistics directly from coordinator
             optimizer_stats = service_coordinator.data.get("optimizer_stats", {}) if service_coordinator.data else {}
             
@@ -274,8 +260,6 @@ async def async_setup_connection(hass):
             connection.send_error(msg["id"], "update_failed", str(e))
 
     websocket_api.async_register_command(hass, handle_update_device_config)
-    websocket_api.async_register_command(hass, handle_reset_device)
-    websocket_api.async_register_command(hass, handle_set_simulation_offset)
     websocket_api.async_register_command(hass, handle_get_history)
     websocket_api.async_register_command(hass, handle_get_statistics)
     
@@ -300,11 +284,7 @@ async def async_setup_connection(hass):
             if not re.match(r"^#[0-9a-fA-F]{6}$", color):
                 raise ValueError(f"Invalid color format: {color}")
 
-            service_entry = _get_service_entry(hass)
-            if not service_entry:
-                raise ValueError("Service entry not found")
-                
-            service_coordinator = hass.data[DOMAIN].get(service_entry.entry_id)
+            service_coordinator = hass.data[DOMAIN].get("service")
             if not service_coordinator:
                 raise ValueError("Service coordinator not found")
                 
@@ -14,6 +14,7 @@ Organization:
 6. Attributes: Custom attributes added to entities
 """
 
+import functools
 import re
 
 # ============================================================================
@@ -36,6 +37,11 @@ PANEL_URL = "pv-optimizer"                # URL path for the panel (e.g., /pv-op
 # UTILITY FUNCTIONS
 # ============================================================================
 
+_INVALID_CHARS_RE = re.compile(r'[^a-z0-9_]+')
+_MULTI_UNDERSCORE_RE = re.compile(r'_+')
+
+
+@functools.lru_cache(maxsize=256)
 def normalize_device_name(name: str) -> str:
     """
     Normalize device name to a safe identifier (entity_id format).
@@ -64,6 +70,9 @@ def normalize_device_name(name: str) -> str:
     - Generating unique entity IDs
     - Ensuring cross-platform compatibility
     
+    Results are cached: the function is pure and every entity of a device
+    normalizes the same name.
+    
     Args:
         name: User-provided device name (can contain any characters)
     
@@ -78,7 +87,7 @@ def normalize_device_name(name: str) -> str:
     # - lowercase letters (a-z)
     # - digits (0-9)
     # - underscores (_)
-    name = re.sub(r'[^a-z0-9_]+', '_', name)
+    name = _INVALID_CHARS_RE.sub('_', name)
     
     # Remove leading/trailing underscores
     # Example: "_test_device_" becomes "test_device"
@@ -86,7 +95,7 @@ def normalize_device_name(name: str) -> str:
     
     # Replace multiple consecutive underscores with single underscore
     # Example: "test__device" becomes "test_device"
-    name = re.sub(r'_+', '_', name)
+    name = _MULTI_UNDERSCORE_RE.sub('_', name)
     
     return name
 
@@ -111,26 +120,6 @@ DEVICE_COLORS = [
 ]
 
 
-# ============================================================================
-# DEVICE COLORS
-# ============================================================================
-# Predefined color palette for device visualization
-# These colors are used consistently across charts, power bars, and device cards
-
-DEVICE_COLORS = [
-    '#4CAF50',  # Green
-    '#2196F3',  # Blue
-    '#FFC107',  # Amber
-    '#9C27B0',  # Purple
-    '#F44336',  # Red
-    '#00BCD4',  # Cyan
-    '#FF9800',  # Orange
-    '#795548',  # Brown
-    '#607D8B',  # Blue Grey
-    '#E91E63'   # Pink
-]
-
-
 # ============================================================================
 # GLOBAL CONFIGURATION CONSTANTS
 # ============================================================================
@@ -220,10 +209,6 @@ CONF_POWER_THRESHOLD = "power_threshold"
 # Hex color code for consistent visualization across UI elements
 CONF_DEVICE_COLOR = "device_color"
 
-# Device Color
-# Hex color code for consistent visualization across UI elements
-CONF_DEVICE_COLOR = "device_color"
-
 
 # ============================================================================
 # DEVICE TYPE CONSTANTS
@@ -264,3 +249,12 @@ ATTR_IS_LOCKED = "is_locked"
 # The averaged power consumption over the sliding window
 # This smoothed value is used for budget calculations
 ATTR_POWER_MEASURED_AVERAGE = "power_measured_average"
+
+
+# ============================================================================
+# ENTITY STATE CONSTANTS
+# ============================================================================
+
+# States of source entities (sensors, switches, numbers) that carry no usable value
+# A frozenset so the membership check on the hot state-read paths is a hash lookup
+UNAVAILABLE_STATES = frozenset(("unknown", "unavailable"))
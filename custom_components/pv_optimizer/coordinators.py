@@ -26,11 +26,13 @@ import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.storage import Store
 from homeassistant.components.recorder import get_instance
 from homeassistant.components.recorder.history import get_significant_states
@@ -64,6 +66,7 @@ from .const import (
     ATTR_PVO_LAST_TARGET_STATE,
     ATTR_IS_LOCKED,
     ATTR_POWER_MEASURED_AVERAGE,
+    UNAVAILABLE_STATES,
     normalize_device_name,
     DEVICE_COLORS,
 )
@@ -71,6 +74,10 @@ from .device import create_device, PVDevice
 
 _LOGGER = logging.getLogger(__name__)
 
+# Delay before UI-driven config changes are written to the config entry.
+# Re-armed on every change so a slider drag results in a single write.
+CONFIG_SAVE_DELAY = 2  # seconds
+
 
 class DeviceCoordinator(DataUpdateCoordinator):
     """
@@ -97,20 +104,32 @@ class DeviceCoordinator(DataUpdateCoordinator):
             _LOGGER,
             name=f"{DOMAIN}_{device_name}",
             update_interval=timedelta(seconds=10),  # Device state updates every 10s
+            # Skip entity writes on ticks where the device state didn't change
+            always_update=False,
         )
         self.config_entry = config_entry
         self.device_config = device_config
         self.device_name = device_name
         self.device_id = None  # Will be populated on first update
         
+        self.normalized_name = normalize_device_name(device_name)
+        # Per-entry key "<entry_id>_<normalized name>" shared by the device
+        # registry identifier and the storage key
+        self.device_key = f"{config_entry.entry_id}_{self.normalized_name}"
+        self.device_identifier = (DOMAIN, self.device_key)
+        # Shared by all entities of this device
+        self.device_info = DeviceInfo(identifiers={self.device_identifier})
+        self.unique_id_prefix = f"{config_entry.entry_id}_"
+        
+        # Pending debounced config entry write
+        self._unsub_config_save = None
+        
         # Backwards compatibility: Assign random color if not present
         if CONF_DEVICE_COLOR not in self.device_config:
             import random
             self.device_config[CONF_DEVICE_COLOR] = random.choice(DEVICE_COLORS)
             # Update config entry with the new color
-            new_data = dict(config_entry.data)
-            new_data["device_config"] = self.device_config
-            hass.config_entries.async_update_entry(config_entry, data=new_data)
+            self._async_save_config()
         
         # Device instance for state reading/control
         self.device_instance: Optional[PVDevice] = None
@@ -130,7 +149,7 @@ class DeviceCoordinator(DataUpdateCoordinator):
         self._unsub_listeners: List = []
         
         # Persistence
-        self._store = Store(hass, 1, f"pv_optimizer_device_{config_entry.entry_id}_{normalize_device_name(device_name)}")
+        self._store = Store(hass, 1, f"pv_optimizer_device_{self.device_key}")
         
     def set_fault_lock(self, lock_status: bool):
         """Set or clear the fault lock on the device."""
@@ -181,8 +200,7 @@ class DeviceCoordinator(DataUpdateCoordinator):
             
         # Retrieve device ID from registry
         dev_reg = dr.async_get(self.hass)
-        normalized_name = normalize_device_name(self.device_name)
-        device = dev_reg.async_get_device(identifiers={(DOMAIN, f"{self.config_entry.entry_id}_{normalized_name}")})
+        device = dev_reg.async_get_device(identifiers={self.device_identifier})
         if device:
             self.device_id = device.id
         else:
@@ -259,27 +277,25 @@ class DeviceCoordinator(DataUpdateCoordinator):
         # Retry device_id lookup if it's None (race condition handling)
         if self.device_id is None:
             dev_reg = dr.async_get(self.hass)
-            normalized_name = normalize_device_name(self.device_name)
-            identifier = (DOMAIN, f"{self.config_entry.entry_id}_{normalized_name}")
             
             _LOGGER.debug(
                 "Attempting device_id lookup for %s with identifier %s",
                 self.device_name,
-                identifier
+                self.device_identifier
             )
             
-            device_entry = dev_reg.async_get_device(identifiers={identifier})
+            device_entry = dev_reg.async_get_device(identifiers={self.device_identifier})
             if device_entry:
                 self.device_id = device_entry.id
                 _LOGGER.info("Found device_id %s for %s", self.device_id, self.device_name)
             else:
+                # Use the registry's per-entry index instead of scanning every device
                 _LOGGER.debug(
                     "Device not found for %s. Available devices for this entry: %s",
                     self.device_name,
                     [
                         (dev.name, dev.identifiers)
-                        for dev in dev_reg.devices.values()
-                        if self.config_entry.entry_id in dev.config_entries
+                        for dev in dr.async_entries_for_config_entry(dev_reg, self.config_entry.entry_id)
                     ]
                 )
         
@@ -295,7 +311,7 @@ class DeviceCoordinator(DataUpdateCoordinator):
                  self.hass.async_create_task(self.device_instance.deactivate())
                  # Update local state immediately for responsiveness
                  is_on = False
-                 self.device_state[ATTR_PVO_LAST_TARGET_STATE] = False
+                 self._set_last_target_state(False)
                  self.last_switch_time = now
                  # Recalculate lock status with new state (though likely irrelevant as it's off)
                  locked_timing, locked_manual, lock_reason = self._get_lock_status(is_on, is_indeterminate)
@@ -314,7 +330,6 @@ class DeviceCoordinator(DataUpdateCoordinator):
             "is_available": is_available,
             "device_id": getattr(self, "device_id", None),
             ATTR_PVO_LAST_TARGET_STATE: self.device_state.get(ATTR_PVO_LAST_TARGET_STATE, is_on),
-            "last_update": now,
         }
         
         return self.device_state
@@ -346,7 +361,7 @@ class DeviceCoordinator(DataUpdateCoordinator):
         # Check all entities
         for entity_id in entities_to_check:
             state = self.hass.states.get(entity_id)
-            if state is None or state.state in ["unavailable", "unknown"]:
+            if state is None or state.state in UNAVAILABLE_STATES:
                 _LOGGER.debug(f"{self.device_name}: Entity {entity_id} is unavailable/unknown")
                 return False
                 
@@ -359,7 +374,7 @@ class DeviceCoordinator(DataUpdateCoordinator):
             return self.device_config.get(CONF_POWER, 0.0)
             
         state = self.hass.states.get(power_sensor)
-        return float(state.state) if state and state.state not in ['unknown', 'unavailable'] else 0.0
+        return float(state.state) if state and state.state not in UNAVAILABLE_STATES else 0.0
 
     async def _get_averaged_power(self, now: datetime, global_config: Dict[str, Any]) -> float:
         """Get averaged power consumption over sliding window."""
@@ -376,14 +391,14 @@ class DeviceCoordinator(DataUpdateCoordinator):
             )
             if power_sensor in history and history[power_sensor]:
                 values = [float(state.state) for state in history[power_sensor] 
-                         if state.state not in ['unknown', 'unavailable']]
+                         if state.state not in UNAVAILABLE_STATES]
                 return sum(values) / len(values) if values else 0.0
         except Exception as e:
             _LOGGER.warning(f"Failed to get averaged power for {self.device_name}: {e}")
         
         # Fallback
         state = self.hass.states.get(power_sensor)
-        return float(state.state) if state and state.state not in ['unknown', 'unavailable'] else 0.0
+        return float(state.state) if state and state.state not in UNAVAILABLE_STATES else 0.0
 
     def _get_lock_status(self, current_state: bool, is_indeterminate: bool = False) -> tuple[bool, bool, str]:
         """
@@ -464,8 +479,7 @@ class DeviceCoordinator(DataUpdateCoordinator):
                     _LOGGER.info(f"{self.device_name}: Optimization disabled. Turning OFF device immediately.")
                     if self.device_instance:
                         await self.device_instance.deactivate()
-                        self.device_state[ATTR_PVO_LAST_TARGET_STATE] = False
-                        self.device_state[ATTR_PVO_LAST_TARGET_STATE] = False
+                        self._set_last_target_state(False)
                         self.last_switch_time = dt_util.now()
                         await self._async_save_state()
                 else:
@@ -473,11 +487,10 @@ class DeviceCoordinator(DataUpdateCoordinator):
 
         self.device_config.update(updates)
         
-        # Update config entry
-        new_data = dict(self.config_entry.data)
-        new_data["device_config"] = self.device_config
-        
-        self.hass.config_entries.async_update_entry(self.config_entry, data=new_data)
+        # Update config entry right away (supersedes any pending debounced save)
+        self._async_save_config()
+        # Config isn't part of the compared data; refresh entities showing it
+        self.async_update_listeners()
         _LOGGER.info(f"Updated config for device {self.device_name}: {updates}")
         
         # Trigger refresh
@@ -488,21 +501,76 @@ class DeviceCoordinator(DataUpdateCoordinator):
             await self.service_coordinator.async_request_refresh()
 
     def update_config(self, key: str, value: Any) -> None:
-        """Update device configuration in memory."""
+        """
+        Update device configuration and schedule persisting it.
+        
+        Changes from all entities of the device (e.g. the restores during
+        startup) share one debounced config entry write.
+        """
+        if self.device_config.get(key) == value:
+            return
         self.device_config[key] = value
+        self.schedule_config_save()
+        # Config isn't part of the compared data; refresh entities showing it
+        self.async_update_listeners()
+
+    @callback
+    def schedule_config_save(self) -> None:
+        """Persist device_config to the config entry after CONFIG_SAVE_DELAY."""
+        if self._unsub_config_save:
+            self._unsub_config_save()
+        self._unsub_config_save = async_call_later(
+            self.hass, CONFIG_SAVE_DELAY, self._async_save_config
+        )
+
+    @callback
+    def async_set_device_config(self, device_config: Dict[str, Any]) -> None:
+        """Replace device_config (e.g. from the options flow) and persist it now."""
+        self.device_config = device_config
+        self._async_save_config()
+        self.async_update_listeners()
+
+    @callback
+    def async_flush_config(self) -> None:
+        """Write a pending debounced config save immediately."""
+        if self._unsub_config_save:
+            self._async_save_config()
+
+    @callback
+    def _async_save_config(self, _now: Optional[datetime] = None) -> None:
+        """Write device_config to the config entry."""
+        if self._unsub_config_save:
+            self._unsub_config_save()
+            self._unsub_config_save = None
+        # Snapshot device_config - handing over the live dict would make later
+        # in-place changes invisible to async_update_entry's change detection
+        self.hass.config_entries.async_update_entry(
+            self.config_entry,
+            data={**self.config_entry.data, "device_config": dict(self.device_config)},
+        )
+
+    def _set_last_target_state(self, target: Optional[bool]) -> None:
+        """
+        Record the last target state in a new device_state dict.
+        
+        device_state is also the coordinator's data - writing into it in place
+        would change the previous data too, so the always_update=False
+        comparison on the next refresh would not see the change.
+        """
+        self.device_state = {**self.device_state, ATTR_PVO_LAST_TARGET_STATE: target}
 
     async def activate(self) -> None:
         """Activate the device."""
         if self.device_instance:
             await self.device_instance.activate()
-            self.device_state[ATTR_PVO_LAST_TARGET_STATE] = True
+            self._set_last_target_state(True)
             self.last_switch_time = dt_util.now() # PVO initiated switch
 
     async def deactivate(self) -> None:
         """Deactivate the device."""
         if self.device_instance:
             await self.device_instance.deactivate()
-            self.device_state[ATTR_PVO_LAST_TARGET_STATE] = False
+            self._set_last_target_state(False)
             self.last_switch_time = dt_util.now() # PVO initiated switch
 
     async def reset_target_state(self) -> None:
@@ -520,9 +588,9 @@ class DeviceCoordinator(DataUpdateCoordinator):
         if is_indeterminate and self.device_instance:
             _LOGGER.info(f"Resetting indeterminate device {self.device_name} to deactivated state to clear manual lock")
             await self.device_instance.deactivate()
-            self.device_state[ATTR_PVO_LAST_TARGET_STATE] = False
+            self._set_last_target_state(False)
         else:
-            self.device_state[ATTR_PVO_LAST_TARGET_STATE] = None
+            self._set_last_target_state(None)
             
         await self._async_save_state()
         _LOGGER.info(f"Reset target state for device: {self.device_name}")
@@ -576,7 +644,9 @@ class ServiceCoordinator(DataUpdateCoordinator):
 
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         """Initialize the service coordinator."""
-        global_config = config_entry.data.get("global", {})
+        # Copy so in-place updates don't also mutate config_entry.data, which
+        # would hide them from async_update_entry's change detection
+        global_config = dict(config_entry.data.get("global", {}))
         
         super().__init__(
             hass,
@@ -586,12 +656,28 @@ class ServiceCoordinator(DataUpdateCoordinator):
         )
         self.config_entry = config_entry
         self.global_config = global_config
+        self._update_surplus_config()
+        # Shared by all service entities. Carries the full details because the
+        # sensor platform is set up before the service device is registered.
+        self.device_identifier = (DOMAIN, "service")
+        self.device_info = DeviceInfo(
+            identifiers={self.device_identifier},
+            name="PV Optimizer",
+            manufacturer="PV Optimizer",
+            model="Service",
+        )
+        self.unique_id_prefix = f"{config_entry.entry_id}_"
         # Registry of device coordinators
         self.device_coordinators: Dict[str, DeviceCoordinator] = {}
         
         # Simulation specific
         self.simulation_surplus_offset: float = 0.0
         
+        # Per-cycle lookup tables (device name -> value), rebuilt at the start
+        # of every optimization cycle and shared by the real and simulation passes
+        self._power_by_name: Dict[str, float] = {}
+        self._priority_by_name: Dict[str, int] = {}
+        
         # State change listeners
         self._unsub_listeners: List = []
     
@@ -652,9 +738,11 @@ class ServiceCoordinator(DataUpdateCoordinator):
     async def async_set_config(self, data: Dict[str, Any]) -> None:
         """Update global configuration."""
         self.global_config.update(data)
-        new_data = dict(self.config_entry.data)
-        new_data["global"] = self.global_config
-        self.hass.config_entries.async_update_entry(self.config_entry, data=new_data)
+        self._update_surplus_config()
+        self.hass.config_entries.async_update_entry(
+            self.config_entry,
+            data={**self.config_entry.data, "global": dict(self.global_config)},
+        )
         self.async_set_update_interval(timedelta(seconds=self.global_config[CONF_OPTIMIZATION_CYCLE_TIME]))
 
     async def _async_update_data(self) -> Dict[str, Any]:
@@ -665,19 +753,35 @@ class ServiceCoordinator(DataUpdateCoordinator):
         """
         _LOGGER.debug("⚡ Bolt: Starting performance measurement for optimization cycle.")
         start_time = time.time()
-        # Collect device states from all device coordinators
+        # Collect device states in a single pass, resolving per-device config,
+        # the real/simulation device lists and the power totals along the way
         device_states = {}
+        power_by_name = {}
+        priority_by_name = {}
+        real_devices = []
+        sim_devices = []
+        power_measured_total = 0
+        power_rated_total = 0
         for device_name, coordinator in self.device_coordinators.items():
-            if coordinator.data:
-                device_states[device_name] = coordinator.data
-            else:
+            state = coordinator.data
+            if not state:
                 _LOGGER.warning(f"No data from device coordinator: {device_name}")
+                continue
+            config = coordinator.device_config
+            device_states[device_name] = state
+            power = power_by_name[device_name] = config.get(CONF_POWER, 0)
+            priority_by_name[device_name] = config.get(CONF_PRIORITY, 5)
+            if config.get(CONF_OPTIMIZATION_ENABLED, True):
+                real_devices.append((device_name, state))
+            if config.get(CONF_SIMULATION_ACTIVE, False):
+                sim_devices.append((device_name, state))
+            if state.get("is_on"):
+                power_measured_total += state.get("power_measured", 0)
+                power_rated_total += power
+        self._power_by_name = power_by_name
+        self._priority_by_name = priority_by_name
         
         # Run real optimization
-        real_devices = [
-            (name, state) for name, state in device_states.items()
-            if self._get_device_config(name).get(CONF_OPTIMIZATION_ENABLED, True)
-        ]
         real_power_budget = await self._calculate_power_budget(real_devices)
         real_ideal_list = await self._calculate_ideal_state(real_power_budget, real_devices, ignore_manual_lock=False)
         await self._synchronize_states(real_ideal_list, real_devices)
@@ -687,10 +791,6 @@ class ServiceCoordinator(DataUpdateCoordinator):
         surplus_current = self._get_current_surplus()
         
         # Run simulation optimization
-        sim_devices = [
-            (name, state) for name, state in device_states.items()
-            if self._get_device_config(name).get(CONF_SIMULATION_ACTIVE, False)
-        ]
         sim_power_budget = await self._calculate_power_budget(sim_devices, surplus_offset=self.simulation_surplus_offset)
         # SIMULATION IGNORES MANUAL LOCKS
         sim_ideal_list = await self._calculate_ideal_state(sim_power_budget, sim_devices, ignore_manual_lock=True)
@@ -708,19 +808,6 @@ class ServiceCoordinator(DataUpdateCoordinator):
             f"  Simulation: Budget={sim_power_budget:.2f}W, Ideal devices={sim_ideal_list}"
         )
         
-        # Calculate totals
-        power_measured_total = sum(
-            state.get("power_measured", 0) 
-            for state in device_states.values() 
-            if state.get("is_on")
-        )
-        
-        power_rated_total = sum(
-            self._get_device_config(name).get(CONF_POWER, 0)
-            for name, state in device_states.items()
-            if state.get("is_on")
-        )
-
         _LOGGER.warning(f"DEBUG TOTALS: Measured={power_measured_total}, Rated={power_rated_total}")
         _LOGGER.warning(f"DEBUG DEVICE STATES: {device_states}")
 
@@ -749,11 +836,6 @@ class ServiceCoordinator(DataUpdateCoordinator):
             "last_update_timestamp": dt_util.now(),
         }
 
-    def _get_device_config(self, device_name: str) -> Dict[str, Any]:
-        """Get device config from coordinator."""
-        coordinator = self.device_coordinators.get(device_name)
-        return coordinator.device_config if coordinator else {}
-
     async def _calculate_power_budget(self, devices: List[tuple[str, Dict[str, Any]]], surplus_offset: float = 0.0) -> float:
         """Calculate available power budget."""
         surplus_avg = await self._get_averaged_surplus()
@@ -764,8 +846,7 @@ class ServiceCoordinator(DataUpdateCoordinator):
         running_manageable_power = 0.0
         for device_name, state in devices:
             if state.get("is_on") and not state.get(ATTR_IS_LOCKED, False):
-                config = self._get_device_config(device_name)
-                power = state.get(ATTR_POWER_MEASURED_AVERAGE, config.get(CONF_POWER, 0.0))
+                power = state.get(ATTR_POWER_MEASURED_AVERAGE, self._power_by_name.get(device_name, 0.0))
                 running_manageable_power += power
         
         budget = surplus_avg + running_manageable_power
@@ -777,8 +858,9 @@ class ServiceCoordinator(DataUpdateCoordinator):
         """Set the surplus offset for simulation."""
         self.simulation_surplus_offset = float(offset)
         _LOGGER.info(f"Set simulation surplus offset to {offset}W")
-        # Trigger update
-        self.async_set_updated_data(self.data)
+        # Trigger update - async_request_refresh goes through the coordinator's
+        # debouncer, so a slider drag coalesces into a single optimization run.
+        # (Pushing the old self.data first only re-rendered stale values.)
         self.hass.async_create_task(self.async_request_refresh())
 
     async def _calculate_ideal_state(self, power_budget: float, devices: List[tuple[str, Dict[str, Any]]], ignore_manual_lock: bool = False) -> List[str]:
@@ -786,14 +868,15 @@ class ServiceCoordinator(DataUpdateCoordinator):
         ideal_on_list = []
         remaining_budget = power_budget
         
+        power_by_name = self._power_by_name
+        
         # Group by priority
         devices_by_priority = {}
         for device_name, state in devices:
-            config = self._get_device_config(device_name)
-            priority = config.get(CONF_PRIORITY, 5)
+            priority = self._priority_by_name.get(device_name, 5)
             if priority not in devices_by_priority:
                 devices_by_priority[priority] = []
-            devices_by_priority[priority].append((device_name, state, config))
+            devices_by_priority[priority].append((device_name, state, power_by_name.get(device_name, 0)))
         
         _LOGGER.debug(f"Calculating ideal state. Budget={power_budget:.2f}W, Priorities={list(devices_by_priority.keys())}, IgnoreManual={ignore_manual_lock}")
         
@@ -805,18 +888,17 @@ class ServiceCoordinator(DataUpdateCoordinator):
             
             # Update budget
             for device_name in selected:
-                _, _, config = next(d for d in priority_devices if d[0] == device_name)
-                power = config.get(CONF_POWER, 0)
+                power = power_by_name[device_name]
                 remaining_budget -= power
                 _LOGGER.debug(f"Selected {device_name} (Prio {priority}, {power}W). Remaining Budget={remaining_budget:.2f}W")
         
         return ideal_on_list
 
-    def _knapsack_select(self, devices: List[tuple[str, Dict[str, Any], Dict[str, Any]]], budget: float, ignore_manual_lock: bool = False) -> List[str]:
-        """Select devices via greedy knapsack."""
+    def _knapsack_select(self, devices: List[tuple[str, Dict[str, Any], float]], budget: float, ignore_manual_lock: bool = False) -> List[str]:
+        """Select devices via greedy knapsack (devices are (name, state, power) tuples)."""
         # Filter locked devices
         available = []
-        for name, state, config in devices:
+        for name, state, power in devices:
             # Determine if locked based on mode
             is_locked = False
             if ignore_manual_lock:
@@ -831,14 +913,13 @@ class ServiceCoordinator(DataUpdateCoordinator):
                     _LOGGER.debug(f"Skipping {name}: Locked")
             
             if not is_locked:
-                available.append((name, state, config))
+                available.append((name, state, power))
         
         # Sort by power descending
-        available.sort(key=lambda d: d[2].get(CONF_POWER, 0), reverse=True)
+        available.sort(key=lambda d: d[2], reverse=True)
         
         selected = []
-        for device_name, state, config in available:
-            power = config.get(CONF_POWER, 0)
+        for device_name, state, power in available:
             if power <= budget:
                 selected.append(device_name)
                 budget -= power
@@ -849,12 +930,13 @@ class ServiceCoordinator(DataUpdateCoordinator):
 
     async def _synchronize_states(self, ideal_on_list: List[str], devices: List[tuple[str, Dict[str, Any]]]) -> None:
         """Synchronize device states with ideal list."""
+        ideal_on = set(ideal_on_list)
         for device_name, state in devices:
             coordinator = self.device_coordinators.get(device_name)
             if not coordinator:
                 continue
             
-            should_be_on = device_name in ideal_on_list
+            should_be_on = device_name in ideal_on
             currently_on = state.get("is_on", False)
             is_locked = state.get(ATTR_IS_LOCKED, False)
             
@@ -890,41 +972,35 @@ class ServiceCoordinator(DataUpdateCoordinator):
                     f"Clearing last_target_state to allow retry."
                 )
                 # Clear last_target_state to prevent lock and allow retry
-                coordinator.device_state[ATTR_PVO_LAST_TARGET_STATE] = None
+                coordinator._set_last_target_state(None)
                 coordinator.async_set_updated_data(coordinator.device_state)
             else:
                 _LOGGER.debug(f"Switch verification successful for {device_name}: state is {actual_state}")
 
+    def _update_surplus_config(self) -> None:
+        """Precompute the surplus sensor and the factor that turns its readings into surplus."""
+        self._surplus_entity = self.global_config.get(CONF_SURPLUS_SENSOR_ENTITY_ID)
+        # Requirements state Negative = Surplus.
+        # We invert by default so that internal logic sees Positive = Surplus.
+        # If user checks "Invert Surplus", we invert AGAIN (effectively keeping original sign).
+        self._surplus_sign = 1.0 if self.global_config.get(CONF_INVERT_SURPLUS_VALUE, False) else -1.0
+
     def _get_current_surplus(self) -> float:
         """Get current instantaneous PV surplus."""
-        surplus_entity = self.global_config.get(CONF_SURPLUS_SENSOR_ENTITY_ID)
+        surplus_entity = self._surplus_entity
         if not surplus_entity:
             return 0.0
         
         state = self.hass.states.get(surplus_entity)
-        current = float(state.state) if state and state.state not in ['unknown', 'unavailable'] else 0.0
-        
-        # Requirements state Negative = Surplus.
-        # We invert by default so that internal logic sees Positive = Surplus.
-        current = current * -1
-        
-        # Configured inversion (flip it back if user wants)
-        if self.global_config.get(CONF_INVERT_SURPLUS_VALUE, False):
-            current = current * -1
-            
-        return current
+        current = float(state.state) if state and state.state not in UNAVAILABLE_STATES else 0.0
+        return current * self._surplus_sign
 
     async def _get_averaged_surplus(self) -> float:
         """Get averaged PV surplus."""
-        surplus_entity = self.global_config.get(CONF_SURPLUS_SENSOR_ENTITY_ID)
+        surplus_entity = self._surplus_entity
         if not surplus_entity:
             return 0.0
         
-        # Requirements state Negative = Surplus.
-        # We invert by default so that internal logic sees Positive = Surplus.
-        # If user checks "Invert Surplus", we invert AGAIN (effectively keeping original sign).
-        invert_config = self.global_config.get(CONF_INVERT_SURPLUS_VALUE, False)
-        
         window_minutes = self.global_config.get(CONF_SLIDING_WINDOW_SIZE, 5)
         now = dt_util.now()
         start_time = now - timedelta(minutes=window_minutes)
@@ -935,29 +1011,11 @@ class ServiceCoordinator(DataUpdateCoordinator):
             )
             if surplus_entity in history and history[surplus_entity]:
                 values = [float(state.state) for state in history[surplus_entity] 
-                         if state.state not in ['unknown', 'unavailable']]
+                         if state.state not in UNAVAILABLE_STATES]
                 avg = sum(values) / len(values) if values else 0.0
-                
-                # Default inversion (Negative -> Positive)
-                avg = avg * -1
-                
-                # Configured inversion (flip it back if user wants)
-                if invert_config:
-                    avg = avg * -1
-                    
-                return avg
+                return avg * self._surplus_sign
         except Exception as e:
             _LOGGER.warning(f"Failed to get averaged surplus: {e}")
         
         # Fallback
-        state = self.hass.states.get(surplus_entity)
-        current = float(state.state) if state and state.state not in ['unknown', 'unavailable'] else 0.0
-        
-        # Default inversion (Negative -> Positive)
-        current = current * -1
-        
-        # Configured inversion
-        if invert_config:
-            current = current * -1
-            
-        return current
+        return self._get_current_surplus()
@@ -167,26 +167,23 @@ class SwitchDevice(PVDevice):
         super().__init__(hass, device_config, coordinator)
         self.switch_entity_id = device_config[CONF_SWITCH_ENTITY_ID]
         self.invert = device_config.get(CONF_INVERT_SWITCH, False)
+        # This solves the problem of handling inverted switches where 'off' means activated.
+        # Resolved once here instead of on every activate/deactivate call.
+        self._activated_state = "off" if self.invert else "on"
+        self._deactivated_state = "on" if self.invert else "off"
+        self._activate_service = f"turn_{self._activated_state}"
+        self._deactivate_service = f"turn_{self._deactivated_state}"
+        self._service_data = {"entity_id": self.switch_entity_id}
 
     async def activate(self) -> None:
         """Activate the switch device."""
-        # This solves the problem of handling inverted switches where 'off' means activated
-        target_state = "off" if self.invert else "on"
-        await self.hass.services.async_call(
-            "switch", f"turn_{target_state}",
-            {"entity_id": self.switch_entity_id}
-        )
-        _LOGGER.debug(f"Activated switch device {self.name}: set {self.switch_entity_id} to {target_state}")
+        await self.hass.services.async_call("switch", self._activate_service, self._service_data)
+        _LOGGER.debug(f"Activated switch device {self.name}: set {self.switch_entity_id} to {self._activated_state}")
 
     async def deactivate(self) -> None:
         """Deactivate the switch device."""
-        # This solves the problem of handling inverted switches where 'on' means deactivated
-        target_state = "on" if self.invert else "off"
-        await self.hass.services.async_call(
-            "switch", f"turn_{target_state}",
-            {"entity_id": self.switch_entity_id}
-        )
-        _LOGGER.debug(f"Deactivated switch device {self.name}: set {self.switch_entity_id} to {target_state}")
+        await self.hass.services.async_call("switch", self._deactivate_service, self._service_data)
+        _LOGGER.debug(f"Deactivated switch device {self.name}: set {self.switch_entity_id} to {self._deactivated_state}")
 
     def is_on(self) -> bool:
         """Return True if the switch is on (considering invert flag and power threshold)."""
@@ -264,19 +261,21 @@ class NumericDevice(PVDevice):
 
     async def activate(self) -> None:
         """Activate the numeric device by setting targets to activated values."""
-        for target in self.numeric_targets:
-            entity_id = target[CONF_NUMERIC_ENTITY_ID]
-            value = target[CONF_ACTIVATED_VALUE]
-            await self._set_and_verify_value(entity_id, value)
-            _LOGGER.debug(f"Activated numeric device {self.name}: set {entity_id} to {value}")
+        # Targets are independent - set and verify them concurrently so each
+        # target's verification delay isn't added to the next one's
+        await asyncio.gather(*(
+            self._set_and_verify_value(target[CONF_NUMERIC_ENTITY_ID], target[CONF_ACTIVATED_VALUE])
+            for target in self.numeric_targets
+        ))
+        _LOGGER.debug(f"Activated numeric device {self.name}: set {len(self.numeric_targets)} target(s)")
 
     async def deactivate(self) -> None:
         """Deactivate the numeric device by setting targets to deactivated values."""
-        for target in self.numeric_targets:
-            entity_id = target[CONF_NUMERIC_ENTITY_ID]
-            value = target[CONF_DEACTIVATED_VALUE]
-            await self._set_and_verify_value(entity_id, value)
-            _LOGGER.debug(f"Deactivated numeric device {self.name}: set {entity_id} to {value}")
+        await asyncio.gather(*(
+            self._set_and_verify_value(target[CONF_NUMERIC_ENTITY_ID], target[CONF_DEACTIVATED_VALUE])
+            for target in self.numeric_targets
+        ))
+        _LOGGER.debug(f"Deactivated numeric device {self.name}: set {len(self.numeric_targets)} target(s)")
 
     def is_on(self) -> bool:
         """Return True ONLY if ALL numeric targets match the activated value."""
@@ -16,8 +16,11 @@ Storage Strategy:
 """
 
 import logging
+import math
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Deque, Dict, List, Any
 
 from homeassistant.util import dt as dt_util
 from homeassistant.core import HomeAssistant, callback
@@ -31,7 +34,18 @@ _LOGGER = logging.getLogger(__name__)
 STORAGE_VERSION = 1
 STORAGE_KEY = "pv_optimizer_history"
 SNAPSHOT_INTERVAL = timedelta(minutes=5)
+SAVE_DELAY = 3600  # Seconds - flush snapshots to storage at most once per hour
 DEFAULT_RETENTION_DAYS = 7
+SNAPSHOTS_PER_DAY = 288  # 24h / 5min
+
+
+def _snapshot_epoch(snapshot: Dict[str, Any]) -> float:
+    """Return the snapshot time as a POSIX timestamp."""
+    ts_epoch = snapshot.get("ts_epoch")
+    if ts_epoch is None:
+        # Snapshots stored before ts_epoch was introduced only carry the ISO string
+        ts_epoch = dt_util.parse_datetime(snapshot["timestamp"]).timestamp()
+    return ts_epoch
 
 
 class HistoryTracker:
@@ -42,15 +56,25 @@ class HistoryTracker:
         self.hass = hass
         self.config_entry = config_entry
         self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{config_entry.entry_id}")
-        self._snapshots: List[Dict[str, Any]] = []
         self._unsub_interval = None
+        # Options changes reload the service entry (and thus this tracker),
+        # so the retention window only needs to be resolved once.
+        self._retention_days = config_entry.options.get("history_retention_days", DEFAULT_RETENTION_DAYS)
+        self._retention_seconds = self._retention_days * 86400
+        # Hard cap (retention window + 10% headroom) so clock skew or a bad
+        # retention setting cannot grow the buffer without bound
+        self._max_snapshots = math.ceil(self._retention_days * SNAPSHOTS_PER_DAY * 1.1)
+        self._snapshots: Deque[Dict[str, Any]] = deque(maxlen=self._max_snapshots)
+        # Set while a delayed Store write is scheduled - async_delay_save
+        # restarts its timer on every call, so it must only be called once
+        self._save_pending = False
         
     async def async_setup(self):
         """Set up the history tracker."""
         # Load existing snapshots from storage
         data = await self._store.async_load()
         if data:
-            self._snapshots = data.get("snapshots", [])
+            self._snapshots = deque(data.get("snapshots", []), maxlen=self._max_snapshots)
             _LOGGER.info("Loaded %d historical snapshots", len(self._snapshots))
         
         # Start periodic snapshot collection
@@ -88,6 +112,7 @@ class HistoryTracker:
             # Build snapshot
             snapshot = {
                 "timestamp": now.isoformat(),
+                "ts_epoch": now.timestamp(),
                 "surplus_current": stats.get("surplus_current", 0),
                 "surplus_average": stats.get("surplus_average", 0),
                 "budget_real": stats.get("budget_real", 0),
@@ -112,7 +137,10 @@ class HistoryTracker:
                     active_count += 1
                 
                 # Temporary debug logging
-                _LOGGER.debug(f"Snapshot device check: {device_name}, is_on={is_on}, power={device_data.get('power_measured')}")
+                _LOGGER.debug(
+                    "Snapshot device check: %s, is_on=%s, power=%s",
+                    device_name, is_on, device_data.get("power_measured")
+                )
             
             # Add snapshot to history
             self._snapshots.append(snapshot)
@@ -120,9 +148,11 @@ class HistoryTracker:
             # Cleanup old snapshots
             await self._async_cleanup_old_data()
             
-            # Save periodically (every hour to avoid excessive writes)
-            if len(self._snapshots) % 12 == 0:  # Every 12 snapshots = 1 hour
-                await self._async_save()
+            # Coalesce writes - flush at most an hour after the first unsaved
+            # snapshot; the Store only serializes when the flush happens
+            if not self._save_pending:
+                self._save_pending = True
+                self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
                 
             _LOGGER.debug("Snapshot taken: %d active devices (found %d), surplus: %.0fW", 
                          len(snapshot["active_devices"]), active_count, snapshot["surplus_current"])
@@ -132,25 +162,28 @@ class HistoryTracker:
     
     async def _async_cleanup_old_data(self):
         """Remove snapshots older than retention period."""
-        retention_days = self.config_entry.options.get("history_retention_days", DEFAULT_RETENTION_DAYS)
-        # Use timezone-aware current time
-        cutoff = dt_util.now() - timedelta(days=retention_days)
+        cutoff_ts = time.time() - self._retention_seconds
         
-        original_count = len(self._snapshots)
-        # Ensure stored timestamps are parsed as aware datetimes
-        self._snapshots = [
-            s for s in self._snapshots
-            if dt_util.parse_datetime(s["timestamp"]) > cutoff
-        ]
+        # Snapshots are appended in chronological order, so expired ones are
+        # always at the left end of the buffer
+        removed = 0
+        while self._snapshots and _snapshot_epoch(self._snapshots[0]) <= cutoff_ts:
+            self._snapshots.popleft()
+            removed += 1
         
-        removed = original_count - len(self._snapshots)
         if removed > 0:
-            _LOGGER.debug("Removed %d old snapshots (retention: %d days)", removed, retention_days)
+            _LOGGER.debug("Removed %d old snapshots (retention: %d days)", removed, self._retention_days)
+    
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to persist (called by the Store on flush)."""
+        self._save_pending = False
+        return {"snapshots": list(self._snapshots)}
     
     async def _async_save(self):
         """Save snapshots to storage."""
         try:
-            await self._store.async_save({"snapshots": self._snapshots})
+            await self._store.async_save(self._data_to_save())
             _LOGGER.debug("Saved %d snapshots to storage", len(self._snapshots))
         except Exception as err:
             _LOGGER.error("Error saving snapshots: %s", err)
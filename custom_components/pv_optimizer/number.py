@@ -9,7 +9,7 @@ This module creates number entities for device entries:
 """
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict
 
 from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
@@ -21,17 +21,13 @@ from homeassistant.helpers.entity import EntityCategory
 
 from .const import (
     DOMAIN,
-    CONF_NAME,
-    CONF_TYPE,
-    CONF_NUMERIC_TARGETS,
     CONF_NUMERIC_ENTITY_ID,
     CONF_ACTIVATED_VALUE,
     CONF_DEACTIVATED_VALUE,
-    TYPE_NUMERIC,
     CONF_PRIORITY,
     CONF_MIN_ON_TIME,
     CONF_MIN_OFF_TIME,
-    normalize_device_name,
+    UNAVAILABLE_STATES,
 )
 from .coordinators import DeviceCoordinator
 
@@ -45,155 +41,108 @@ async def async_setup_entry(
 ) -> None:
     """Set up numbers for PV Optimizer device."""
     coordinator: DeviceCoordinator = hass.data[DOMAIN][config_entry.entry_id]
-    device_config = config_entry.data.get("device_config", {})
-    device_type = device_config.get(CONF_TYPE)
-    
-    entities = []
-    
-    # Priority number (all devices)
-    entities.append(DevicePriorityNumber(coordinator))
-    
-    # Min on/off time numbers (all devices)
-    entities.append(DeviceMinOnTimeNumber(coordinator))
-    entities.append(DeviceMinOffTimeNumber(coordinator))
     
+    # Priority and min on/off time numbers (all devices)
     # Note: Numeric devices do NOT need target number entities here
     # They control external number entities defined in numeric_targets config
-    
-    async_add_entities(entities)
+    async_add_entities([
+        DevicePriorityNumber(coordinator),
+        DeviceMinOnTimeNumber(coordinator),
+        DeviceMinOffTimeNumber(coordinator),
+    ])
 
 
-class DevicePriorityNumber(CoordinatorEntity, NumberEntity, RestoreEntity):
-    """Priority number for device."""
+def _parse_target_state(state) -> float:
+    """Return a target entity's state as float (0.0 if unavailable or non-numeric)."""
+    if state is None or state.state in UNAVAILABLE_STATES:
+        return 0.0
+    try:
+        return float(state.state)
+    except ValueError:
+        return 0.0
+
+
+class _DeviceConfigNumber(CoordinatorEntity, NumberEntity, RestoreEntity):
+    """
+    Base for numbers backed by a single key in the device config.
+    
+    Subclasses only declare which key they edit and its range.
+    """
     
     _attr_has_entity_name = True
-    _attr_name = "Priority"
+    _attr_native_min_value = 0
+    _attr_native_max_value = 1440  # 24 hours in minutes
+    _attr_native_step = 1
+    _config_key: str
+    _default: int = 0
+    _unique_id_suffix: str
     
     def __init__(self, coordinator: DeviceCoordinator) -> None:
         """Initialize the number."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_priority"
-        self._attr_native_min_value = 1
-        self._attr_native_max_value = 10
-        self._attr_native_step = 1
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}{self._unique_id_suffix}"
         
         # Link to device
-        device_name = coordinator.device_name
-        device_type = coordinator.device_config.get(CONF_TYPE, "Unknown")
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
+        self._attr_device_info = coordinator.device_info
+        self._attr_native_value = coordinator.device_config.get(self._config_key, self._default)
     
     async def async_added_to_hass(self) -> None:
         """Restore state on startup."""
         await super().async_added_to_hass()
         state = await self.async_get_last_state()
-        if state and state.state not in ("unknown", "unavailable"):
+        if state and state.state not in UNAVAILABLE_STATES:
             value = int(float(state.state))
-            self.coordinator.update_config(CONF_PRIORITY, value)
-            _LOGGER.debug(f"Restored priority for {self.coordinator.device_name}: {value}")
+            self.coordinator.update_config(self._config_key, value)
+            self._attr_native_value = value
+            _LOGGER.debug("Restored %s for %s: %s", self._config_key, self.coordinator.device_name, value)
     
-    @property
-    def native_value(self) -> float:
-        """Return the current priority."""
-        return self.coordinator.device_config.get(CONF_PRIORITY, 5)
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Refresh the cached value from the device config."""
+        self._attr_native_value = self.coordinator.device_config.get(self._config_key, self._default)
+        super()._handle_coordinator_update()
     
     async def async_set_native_value(self, value: float) -> None:
-        """Set the priority."""
-        self.coordinator.update_config(CONF_PRIORITY, int(value))
-        _LOGGER.info(f"Updated priority for {self.coordinator.device_name} to {int(value)}")
+        """Set the value."""
+        value = int(value)
+        # Compare against the config itself - the cached value can lag behind it
+        if value == self.coordinator.device_config.get(self._config_key, self._default):
+            return  # e.g. a restore echo from the UI
+        self.coordinator.update_config(self._config_key, value)
+        self._attr_native_value = value
+        _LOGGER.info("Updated %s for %s to %d", self._config_key, self.coordinator.device_name, value)
         self.async_write_ha_state()
 
 
-class DeviceMinOnTimeNumber(CoordinatorEntity, NumberEntity, RestoreEntity):
+class DevicePriorityNumber(_DeviceConfigNumber):
+    """Priority number for device."""
+    
+    _attr_name = "Priority"
+    _attr_native_min_value = 1
+    _attr_native_max_value = 10
+    _config_key = CONF_PRIORITY
+    _default = 5
+    _unique_id_suffix = "priority"
+
+
+class DeviceMinOnTimeNumber(_DeviceConfigNumber):
     """Minimum on time number for device."""
     
-    _attr_has_entity_name = True
     _attr_name = "Min On Time"
     _attr_entity_category = EntityCategory.CONFIG
-    
-    def __init__(self, coordinator: DeviceCoordinator) -> None:
-        """Initialize the number."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_min_on_time"
-        self._attr_native_min_value = 0
-        self._attr_native_max_value = 1440  # 24 hours in minutes
-        self._attr_native_step = 1
-        self._attr_native_unit_of_measurement = "min"
-        
-        # Link to device
-        device_name = coordinator.device_name
-        device_type = coordinator.device_config.get(CONF_TYPE, "Unknown")
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
-    
-    async def async_added_to_hass(self) -> None:
-        """Restore state on startup."""
-        await super().async_added_to_hass()
-        state = await self.async_get_last_state()
-        if state and state.state not in ("unknown", "unavailable"):
-            value = int(float(state.state))
-            self.coordinator.update_config(CONF_MIN_ON_TIME, value)
-            _LOGGER.debug(f"Restored min on time for {self.coordinator.device_name}: {value}")
-    
-    @property
-    def native_value(self) -> float:
-        """Return the current min on time."""
-        return self.coordinator.device_config.get(CONF_MIN_ON_TIME, 0)
-    
-    async def async_set_native_value(self, value: float) -> None:
-        """Set the min on time."""
-        self.coordinator.update_config(CONF_MIN_ON_TIME, int(value))
-        _LOGGER.info(f"Updated min on time for {self.coordinator.device_name} to {int(value)} min")
-        self.async_write_ha_state()
+    _attr_native_unit_of_measurement = "min"
+    _config_key = CONF_MIN_ON_TIME
+    _unique_id_suffix = "min_on_time"
 
 
-class DeviceMinOffTimeNumber(CoordinatorEntity, NumberEntity, RestoreEntity):
+class DeviceMinOffTimeNumber(_DeviceConfigNumber):
     """Minimum off time number for device."""
     
-    _attr_has_entity_name = True
     _attr_name = "Min Off Time"
     _attr_entity_category = EntityCategory.CONFIG
-    
-    def __init__(self, coordinator: DeviceCoordinator) -> None:
-        """Initialize the number."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_min_off_time"
-        self._attr_native_min_value = 0
-        self._attr_native_max_value = 1440  # 24 hours in minutes
-        self._attr_native_step = 1
-        self._attr_native_unit_of_measurement = "min"
-        
-        # Link to device
-        device_name = coordinator.device_name
-        device_type = coordinator.device_config.get(CONF_TYPE, "Unknown")
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
-    
-    async def async_added_to_hass(self) -> None:
-        """Restore state on startup."""
-        await super().async_added_to_hass()
-        state = await self.async_get_last_state()
-        if state and state.state not in ("unknown", "unavailable"):
-            value = int(float(state.state))
-            self.coordinator.update_config(CONF_MIN_OFF_TIME, value)
-            _LOGGER.debug(f"Restored min off time for {self.coordinator.device_name}: {value}")
-    
-    @property
-    def native_value(self) -> float:
-        """Return the current min off time."""
-        return self.coordinator.device_config.get(CONF_MIN_OFF_TIME, 0)
-    
-    async def async_set_native_value(self, value: float) -> None:
-        """Set the min off time."""
-        self.coordinator.update_config(CONF_MIN_OFF_TIME, int(value))
-        _LOGGER.info(f"Updated min off time for {self.coordinator.device_name} to {int(value)} min")
-        self.async_write_ha_state()
+    _attr_native_unit_of_measurement = "min"
+    _config_key = CONF_MIN_OFF_TIME
+    _unique_id_suffix = "min_off_time"
 
 
 class DeviceTargetNumber(CoordinatorEntity, NumberEntity):
@@ -209,23 +158,17 @@ class DeviceTargetNumber(CoordinatorEntity, NumberEntity):
         self._numeric_entity_id = target[CONF_NUMERIC_ENTITY_ID]
         self._activated_value = target[CONF_ACTIVATED_VALUE]
         self._deactivated_value = target[CONF_DEACTIVATED_VALUE]
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{self._numeric_entity_id}_target"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}{self._numeric_entity_id}_target"
         self._attr_native_min_value = min(self._activated_value, self._deactivated_value)
         self._attr_native_max_value = max(self._activated_value, self._deactivated_value)
         
         # Link to device
-        device_name = coordinator.device_name
-        device_type = coordinator.device_config.get(CONF_TYPE, "Unknown")
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
+        self._attr_device_info = coordinator.device_info
     
     @property
     def native_value(self) -> float:
         """Return the current value."""
-        state = self.hass.states.get(self._numeric_entity_id)
-        return float(state.state) if state and state.state not in ['unknown', 'unavailable'] else 0.0
+        return _parse_target_state(self.hass.states.get(self._numeric_entity_id))
     
     async def async_set_native_value(self, value: float) -> None:
         """Set the value."""
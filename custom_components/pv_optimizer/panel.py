@@ -31,6 +31,9 @@ Flow:
 5. Button click navigates to integration's options flow for management
 """
 
+import logging
+from pathlib import Path
+
 from homeassistant.core import HomeAssistant
 from homeassistant.loader import async_get_integration
 from homeassistant.components import panel_custom
@@ -38,6 +41,8 @@ from homeassistant.components.http import StaticPathConfig
 
 from .const import DOMAIN, FRONTEND_URL, PANEL_TITLE, PANEL_ICON, PANEL_URL
 
+_LOGGER = logging.getLogger(__name__)
+
 
 async def async_setup_panel(hass: HomeAssistant):
     """
@@ -53,7 +58,7 @@ async def async_setup_panel(hass: HomeAssistant):
        - Makes the JavaScript panel file accessible via HTTP
        - Path: /pv_optimizer-panel.js
        - File: custom_components/pv_optimizer/www/pv-optimizer-panel.js
-       - Caching disabled during development for easier testing
+       - Cached by browsers; the versioned module URL invalidates it on upgrade
     
     2. Panel Registration:
        - Adds "PV Optimizer" to the sidebar
@@ -82,6 +87,20 @@ async def async_setup_panel(hass: HomeAssistant):
     Returns:
         None
     """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    
+    # Static routes and the panel can only be registered once per HA run
+    if domain_data.get("_panel_registered"):
+        return
+    
+    panel_path = Path(hass.config.path("custom_components/pv_optimizer/www/pv-optimizer-panel.js"))
+    translations_path = hass.config.path("custom_components/pv_optimizer/translations")
+    
+    # Verify the panel file exists - stat() is blocking I/O, so run it in the executor
+    if not await hass.async_add_executor_job(panel_path.exists):
+        _LOGGER.error("PV Optimizer panel file not found: %s", panel_path)
+        return
+    
     # Register static file path for the panel JavaScript
     # This makes the JavaScript file accessible via HTTP at FRONTEND_URL
     # The file contains the panel's UI code written with LitElement
@@ -90,12 +109,12 @@ async def async_setup_panel(hass: HomeAssistant):
             StaticPathConfig(
                 FRONTEND_URL,  # URL path: "/pv_optimizer-panel.js"
                 # Physical file path on disk
-                hass.config.path("custom_components/pv_optimizer/www/pv-optimizer-panel.js"),
-                False,  # Don't cache - useful during development to see changes immediately
+                str(panel_path),
+                True,  # Cache - the module URL carries ?v=<version> for busting on upgrade
             ),
             StaticPathConfig(
                 "/pv_optimizer_translations",  # URL path for translations
-                hass.config.path("custom_components/pv_optimizer/translations"),
+                translations_path,
                 True,  # Cache translations
             )
         ]
@@ -119,3 +138,4 @@ async def async_setup_panel(hass: HomeAssistant):
         embed_iframe=False,
         require_admin=False,
     )
+    domain_data["_panel_registered"] = True
@@ -7,9 +7,16 @@ This module creates sensors for both service and device entries:
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorDeviceClass,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -18,16 +25,108 @@ from homeassistant.helpers.entity import EntityCategory
 
 from .const import (
     DOMAIN,
-    CONF_NAME,
-    ATTR_IS_LOCKED,
     ATTR_POWER_MEASURED_AVERAGE,
     ATTR_PVO_LAST_TARGET_STATE,
-    normalize_device_name,
 )
 from .coordinators import ServiceCoordinator, DeviceCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Last target state (True/False/None) -> (state, icon)
+_TARGET_STATE_DISPLAY = {
+    True: ("On", "mdi:power-plug"),
+    False: ("Off", "mdi:power-plug-off"),
+    None: ("Unknown", "mdi:help-circle"),
+}
+
+# Device type -> configuration summary of the configuration sensor
+_CONFIG_SUMMARY_FNS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "switch": lambda config: (
+        f"Type: Switch | Entity: {config.get('switch_entity_id', 'N/A')} | "
+        f"Invert: {'Yes' if config.get('invert_switch', False) else 'No'}"
+    ),
+    "numeric": lambda config: f"Type: Numeric | Targets: {len(config.get('numeric_targets', []))}",
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class ServiceSensorEntityDescription(SensorEntityDescription):
+    """Describes a service sensor (key doubles as unique_id suffix)."""
+    
+    # (coordinator, coordinator data) -> state; data is {} before the first refresh
+    value_fn: Callable[[ServiceCoordinator, Dict[str, Any]], Any]
+    attributes_fn: Optional[Callable[[ServiceCoordinator, Dict[str, Any]], Dict[str, Any]]] = None
+
+
+def _ideal_device_details(coordinator: ServiceCoordinator, device_list: List[str]) -> Dict[str, Any]:
+    """Return the details of the given ideal devices for frontend display."""
+    device_coordinators = coordinator.device_coordinators
+    device_details = []
+    
+    for device_name in device_list:
+        device_coordinator = device_coordinators.get(device_name)
+        if device_coordinator:
+            config = device_coordinator.device_config
+            measured_power = device_coordinator.data.get("measured_power", 0) if device_coordinator.data else 0
+            device_details.append({
+                "name": device_name,
+                "power": config.get("power", 0),
+                "measured_power": measured_power,
+                "priority": config.get("priority", 5),
+            })
+    
+    return {"device_details": device_details}
+
+
+def _power_description(key: str, name: str, data_key: str) -> ServiceSensorEntityDescription:
+    """Describe a service power sensor reading a rounded value from coordinator data."""
+    return ServiceSensorEntityDescription(
+        key=key,
+        name=name,
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator, data: round(data.get(data_key, 0), 1),
+    )
+
+
+def _ideal_devices_description(key: str, name: str, data_key: str) -> ServiceSensorEntityDescription:
+    """Describe a service sensor listing the ideal devices of one optimization run."""
+    return ServiceSensorEntityDescription(
+        key=key,
+        name=name,
+        value_fn=lambda coordinator, data: ", ".join(data.get(data_key, [])) or "None",
+        attributes_fn=lambda coordinator, data: _ideal_device_details(coordinator, data.get(data_key, [])),
+    )
+
+
+SERVICE_SENSOR_DESCRIPTIONS: Tuple[ServiceSensorEntityDescription, ...] = (
+    _power_description("power_budget", "Power Budget", "power_budget"),
+    _power_description("surplus_avg", "Surplus Avg", "surplus_avg"),
+    _power_description("simulation_power_budget", "Simulation Power Budget", "simulation_power_budget"),
+    _ideal_devices_description("real_ideal_devices", "Real Ideal Devices", "ideal_on_list"),
+    _ideal_devices_description("simulation_ideal_devices", "Simulation Ideal Devices", "simulation_ideal_on_list"),
+)
+
+# Static metadata shared by every device's sensors (key doubles as unique_id suffix)
+POWER_AVG_DESC = SensorEntityDescription(
+    key="measured_power_avg",
+    name="Measured Power Avg",
+    native_unit_of_measurement="W",
+    device_class=SensorDeviceClass.POWER,
+    state_class=SensorStateClass.MEASUREMENT,
+)
+LAST_TARGET_DESC = SensorEntityDescription(
+    key="last_target_state",
+    name="Last Target State",
+)
+CONFIGURATION_DESC = SensorEntityDescription(
+    key="configuration",
+    name="Configuration",
+    icon="mdi:cog",
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -53,15 +152,9 @@ async def _async_setup_service_sensors(
     """Set up service sensors (global sensors)."""
     coordinator: ServiceCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     
-    entities = [
-        ServicePowerBudgetSensor(coordinator),
-        ServiceSurplusAvgSensor(coordinator),
-        ServiceSimulationBudgetSensor(coordinator),
-        ServiceRealIdealDevicesSensor(coordinator),
-        ServiceSimulationIdealDevicesSensor(coordinator),
-    ]
-    
-    async_add_entities(entities)
+    async_add_entities(
+        ServiceSensor(coordinator, description) for description in SERVICE_SENSOR_DESCRIPTIONS
+    )
 
 
 async def _async_setup_device_sensors(
@@ -73,300 +166,156 @@ async def _async_setup_device_sensors(
     coordinator: DeviceCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     
     entities = [
-        DevicePowerSensor(coordinator),
-        DeviceTargetStateSensor(coordinator),
-        DeviceConfigurationSensor(coordinator),  # Shows all config including targets
+        DevicePowerSensor(coordinator, POWER_AVG_DESC),
+        DeviceTargetStateSensor(coordinator, LAST_TARGET_DESC),
+        DeviceConfigurationSensor(coordinator, CONFIGURATION_DESC),  # Shows all config including targets
     ]
     
     async_add_entities(entities)
 
 
+class SkipUnchangedWriteMixin:
+    """Write state on coordinator updates only when the entity actually changed.
+    
+    Subclasses compute their cached ``_attr_*`` values in ``_update_from_data``
+    and may override ``_written_state`` to choose what is compared.
+    """
+    
+    _last_written: Optional[tuple] = None
+    
+    def _update_from_data(self) -> None:
+        """Refresh the cached state from the coordinator."""
+        raise NotImplementedError
+    
+    def _written_state(self) -> tuple:
+        """Return the values whose change requires a state write."""
+        return (self._attr_native_value, self.available)
+    
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the cached state and write it only if something changed."""
+        self._update_from_data()
+        written = self._written_state()
+        if written == self._last_written:
+            return
+        self._last_written = written
+        super()._handle_coordinator_update()
+
+
 # ============================================================================
 # SERVICE SENSORS (Global)
 # ============================================================================
 
-class ServicePowerBudgetSensor(CoordinatorEntity, SensorEntity):
-    """Power budget sensor for service."""
+class ServiceSensor(SkipUnchangedWriteMixin, CoordinatorEntity, SensorEntity):
+    """Global sensor of the service, driven by a ServiceSensorEntityDescription.
     
-    _attr_has_entity_name = True
-    _attr_name = "Power Budget"
-    
-    def __init__(self, coordinator: ServiceCoordinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_power_budget"
-        self._attr_native_unit_of_measurement = "W"
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, "service")},
-            "name": "PV Optimizer",
-            "manufacturer": "PV Optimizer",
-            "model": "Service",
-        }
-    
-    @property
-    def native_value(self) -> float:
-        """Return the power budget."""
-        if self.coordinator.data:
-            return round(self.coordinator.data.get("power_budget", 0), 1)
-        return 0
-
-
-class ServiceSurplusAvgSensor(CoordinatorEntity, SensorEntity):
-    """Surplus average sensor for service."""
-    
-    _attr_has_entity_name = True
-    _attr_name = "Surplus Avg"
-    
-    def __init__(self, coordinator: ServiceCoordinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_surplus_avg"
-        self._attr_native_unit_of_measurement = "W"
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, "service")},
-        }
-    
-    @property
-    def native_value(self) -> float:
-        """Return the surplus average."""
-        if self.coordinator.data:
-            return round(self.coordinator.data.get("surplus_avg", 0), 1)
-        return 0
-
-
-class ServiceSimulationBudgetSensor(CoordinatorEntity, SensorEntity):
-    """Simulation power budget sensor for service."""
+    State and attributes are computed when the coordinator pushes new data
+    instead of on every state read.
+    """
     
     _attr_has_entity_name = True
-    _attr_name = "Simulation Power Budget"
+    entity_description: ServiceSensorEntityDescription
     
-    def __init__(self, coordinator: ServiceCoordinator) -> None:
+    def __init__(self, coordinator: ServiceCoordinator, description: ServiceSensorEntityDescription) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_simulation_power_budget"
-        self._attr_native_unit_of_measurement = "W"
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, "service")},
-        }
-    
-    @property
-    def native_value(self) -> float:
-        """Return the simulation power budget."""
-        if self.coordinator.data:
-            return round(self.coordinator.data.get("simulation_power_budget", 0), 1)
-        return 0
-
-
-class ServiceRealIdealDevicesSensor(CoordinatorEntity, SensorEntity):
-    """Real ideal devices list sensor for service."""
-    
-    _attr_has_entity_name = True
-    _attr_name = "Real Ideal Devices"
-    
-    def __init__(self, coordinator: ServiceCoordinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_real_ideal_devices"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, "service")},
-        }
-    
-    @property
-    def native_value(self) -> str:
-        """Return the real ideal devices list."""
-        if self.coordinator.data:
-            devices = self.coordinator.data.get("ideal_on_list", [])
-            return ", ".join(devices) if devices else "None"
-        return "None"
-    
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return device details for frontend display."""
-        if not self.coordinator.data:
-            return {"device_details": []}
-        
-        device_list = self.coordinator.data.get("ideal_on_list", [])
-        device_details = []
-        
-        for device_name in device_list:
-            coordinator = self.coordinator.device_coordinators.get(device_name)
-            if coordinator:
-                config = coordinator.device_config
-                measured_power = coordinator.data.get("measured_power", 0) if coordinator.data else 0
-                device_details.append({
-                    "name": device_name,
-                    "power": config.get("power", 0),
-                    "measured_power": measured_power,
-                    "priority": config.get("priority", 5),
-                })
-        
-        return {"device_details": device_details}
-
-
-class ServiceSimulationIdealDevicesSensor(CoordinatorEntity, SensorEntity):
-    """Simulation ideal devices list sensor for service."""
-    
-    _attr_has_entity_name = True
-    _attr_name = "Simulation Ideal Devices"
-    
-    def __init__(self, coordinator: ServiceCoordinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_simulation_ideal_devices"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, "service")},
-        }
-    
-    @property
-    def native_value(self) -> str:
-        """Return the simulation ideal devices list."""
-        if self.coordinator.data:
-            devices = self.coordinator.data.get("simulation_ideal_on_list", [])
-            return ", ".join(devices) if devices else "None"
-        return "None"
-    
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return device details for frontend display."""
-        if not self.coordinator.data:
-            return {"device_details": []}
-        
-        device_list = self.coordinator.data.get("simulation_ideal_on_list", [])
-        device_details = []
-        
-        for device_name in device_list:
-            coordinator = self.coordinator.device_coordinators.get(device_name)
-            if coordinator:
-                config = coordinator.device_config
-                measured_power = coordinator.data.get("measured_power", 0) if coordinator.data else 0
-                device_details.append({
-                    "name": device_name,
-                    "power": config.get("power", 0),
-                    "measured_power": measured_power,
-                    "priority": config.get("priority", 5),
-                })
-        
-        return {"device_details": device_details}
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}{description.key}"
+        self._attr_device_info = coordinator.device_info
+        self._update_from_data()
+    
+    def _update_from_data(self) -> None:
+        """Compute state and attributes from coordinator data."""
+        description = self.entity_description
+        data = self.coordinator.data or {}
+        self._attr_native_value = description.value_fn(self.coordinator, data)
+        if description.attributes_fn is not None:
+            self._attr_extra_state_attributes = description.attributes_fn(self.coordinator, data)
+    
+    def _written_state(self) -> tuple:
+        """Include the attributes, which change independently of the state."""
+        return (self._attr_native_value, self.extra_state_attributes, self.available)
 
 
 # ============================================================================
 # DEVICE SENSORS (Per-Device)
 # ============================================================================
 
-class DevicePowerSensor(CoordinatorEntity, SensorEntity):
+class DevicePowerSensor(SkipUnchangedWriteMixin, CoordinatorEntity, SensorEntity):
     """Device measured power sensor."""
     
     _attr_has_entity_name = True
-    _attr_name = "Measured Power Avg"
     
-    def __init__(self, coordinator: DeviceCoordinator) -> None:
+    def __init__(self, coordinator: DeviceCoordinator, description: SensorEntityDescription) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_measured_power_avg"
-        self._attr_native_unit_of_measurement = "W"
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}{description.key}"
         
         # Link to device
-        device_name = coordinator.device_name
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
+        self._attr_device_info = coordinator.device_info
+        self._update_from_data()
     
-    @property
-    def native_value(self) -> float:
-        """Return the measured power."""
-        if self.coordinator.data:
-            return round(self.coordinator.data.get(ATTR_POWER_MEASURED_AVERAGE, 0), 1)
-        return 0
+    def _update_from_data(self) -> None:
+        """Compute the measured power from coordinator data."""
+        data = self.coordinator.data
+        self._attr_native_value = round(data.get(ATTR_POWER_MEASURED_AVERAGE, 0), 1) if data else 0
 
 
-class DeviceTargetStateSensor(CoordinatorEntity, SensorEntity):
+class DeviceTargetStateSensor(SkipUnchangedWriteMixin, CoordinatorEntity, SensorEntity):
     """Device target state sensor."""
     
     _attr_has_entity_name = True
-    _attr_name = "Last Target State"
     
-    def __init__(self, coordinator: DeviceCoordinator) -> None:
+    def __init__(self, coordinator: DeviceCoordinator, description: SensorEntityDescription) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_last_target_state"
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}{description.key}"
         
         # Link to device
-        device_name = coordinator.device_name
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
-    
-    @property
-    def native_value(self) -> str:
-        """Return the target state."""
-        if self.coordinator.data:
-            state = self.coordinator.data.get(ATTR_PVO_LAST_TARGET_STATE)
-            if state is None:
-                return "Unknown"
-            return "On" if state else "Off"
-        return "Unknown"
-    
-    @property
-    def icon(self) -> str:
-        """Return the icon."""
-        value = self.native_value
-        if value == "On":
-            return "mdi:power-plug"
-        elif value == "Off":
-            return "mdi:power-plug-off"
-        return "mdi:help-circle"
+        self._attr_device_info = coordinator.device_info
+        self._update_from_data()
+    
+    def _update_from_data(self) -> None:
+        """Compute the target state from coordinator data."""
+        data = self.coordinator.data
+        state = data.get(ATTR_PVO_LAST_TARGET_STATE) if data else None
+        self._attr_native_value, self._attr_icon = _TARGET_STATE_DISPLAY[
+            None if state is None else bool(state)
+        ]
 
 
 class DeviceConfigurationSensor(CoordinatorEntity, SensorEntity):
     """Device configuration summary sensor."""
     
     _attr_has_entity_name = True
-    _attr_name = "Configuration"
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
     
-    def __init__(self, coordinator: DeviceCoordinator) -> None:
+    def __init__(self, coordinator: DeviceCoordinator, description: SensorEntityDescription) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_configuration"
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}{description.key}"
         
         # Link to device
-        device_name = coordinator.device_name
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
+        self._attr_device_info = coordinator.device_info
     
     @property
     def native_value(self) -> str:
         """Return configuration summary."""
         config = self.coordinator.device_config
         device_type = config.get("type", "unknown")
-        
-        if device_type == "switch":
-            entity = config.get("switch_entity_id", "N/A")
-            invert = "Yes" if config.get("invert_switch", False) else "No"
-            return f"Type: Switch | Entity: {entity} | Invert: {invert}"
-        elif device_type == "numeric":
-            target_count = len(config.get("numeric_targets", []))
-            return f"Type: Numeric | Targets: {target_count}"
-        return f"Type: {device_type}"
+        summary_fn = _CONFIG_SUMMARY_FNS.get(device_type)
+        return summary_fn(config) if summary_fn else f"Type: {device_type}"
     
     @property
     def extra_state_attributes(self) -> dict:
         """Return additional configuration details."""
         config = self.coordinator.device_config
+        device_state = self.coordinator.device_state
+        device_type = config.get("type")
         attrs = {
-            "device_type": config.get("type"),
+            "device_type": device_type,
             "priority": config.get("priority"),
             "nominal_power": config.get("power"),
             "min_on_time": config.get("min_on_time", 0),
@@ -374,16 +323,16 @@ class DeviceConfigurationSensor(CoordinatorEntity, SensorEntity):
             "optimization_enabled": config.get("optimization_enabled", True),
             "simulation_active": config.get("simulation_active", False),
             # Dynamic state
-            "is_locked": self.coordinator.device_state.get("is_locked", False),
-            "is_locked_timing": self.coordinator.device_state.get("is_locked_timing", False),
-            "is_locked_manual": self.coordinator.device_state.get("is_locked_manual", False),
+            "is_locked": device_state.get("is_locked", False),
+            "is_locked_timing": device_state.get("is_locked_timing", False),
+            "is_locked_manual": device_state.get("is_locked_manual", False),
         }
         
         # Add type-specific attributes
-        if config.get("type") == "switch":
+        if device_type == "switch":
             attrs["switch_entity_id"] = config.get("switch_entity_id")
             attrs["invert_switch"] = config.get("invert_switch", False)
-        elif config.get("type") == "numeric":
+        elif device_type == "numeric":
             targets = config.get("numeric_targets", [])
             attrs["numeric_targets_count"] = len(targets)
             for i, target in enumerate(targets):
@@ -396,8 +345,3 @@ class DeviceConfigurationSensor(CoordinatorEntity, SensorEntity):
             attrs["power_threshold"] = config.get("power_threshold", 100)
         
         return attrs
-    
-    @property
-    def icon(self) -> str:
-        """Return the icon."""
-        return "mdi:cog"
@@ -8,7 +8,7 @@ This module creates switch entities for device entries only:
 """
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
@@ -19,7 +19,6 @@ from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import (
     DOMAIN,
-    CONF_NAME,
     CONF_TYPE,
     CONF_SWITCH_ENTITY_ID,
     CONF_INVERT_SWITCH,
@@ -31,9 +30,10 @@ from .const import (
     CONF_NUMERIC_ENTITY_ID,
     CONF_ACTIVATED_VALUE,
     CONF_DEACTIVATED_VALUE,
-    normalize_device_name,
+    UNAVAILABLE_STATES,
 )
 from .coordinators import DeviceCoordinator
+from .sensor import SkipUnchangedWriteMixin
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,18 +45,12 @@ async def async_setup_entry(
 ) -> None:
     """Set up switches for PV Optimizer device."""
     coordinator: DeviceCoordinator = hass.data[DOMAIN][config_entry.entry_id]
-    device_config = config_entry.data.get("device_config", {})
-    device_type = device_config.get(CONF_TYPE)
     
-    entities = []
-    
-    # Optimization enabled switch (all devices)
-    entities.append(DeviceOptimizationSwitch(coordinator))
-    
-    # Simulation active switch (all devices)
-    entities.append(DeviceSimulationSwitch(coordinator))
-    
-    async_add_entities(entities)
+    # Optimization enabled and simulation active switches (all devices)
+    async_add_entities([
+        DeviceOptimizationSwitch(coordinator),
+        DeviceSimulationSwitch(coordinator),
+    ])
 
 
 class DeviceManualSwitch(CoordinatorEntity, SwitchEntity):
@@ -78,14 +72,10 @@ class DeviceManualSwitch(CoordinatorEntity, SwitchEntity):
         # Numeric specific config
         self._numeric_targets = device_config.get(CONF_NUMERIC_TARGETS, [])
         
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_manual_control"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}manual_control"
         
         # Link to device
-        device_name = coordinator.device_name
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
+        self._attr_device_info = coordinator.device_info
     
     @property
     def is_on(self) -> bool:
@@ -104,7 +94,7 @@ class DeviceManualSwitch(CoordinatorEntity, SwitchEntity):
             for target in self._numeric_targets:
                 entity_id = target[CONF_NUMERIC_ENTITY_ID]
                 state = self.hass.states.get(entity_id)
-                if state and state.state not in ['unknown', 'unavailable']:
+                if state and state.state not in UNAVAILABLE_STATES:
                     try:
                         current_value = float(state.state)
                         if current_value == target[CONF_ACTIVATED_VALUE]:
@@ -154,93 +144,76 @@ class DeviceManualSwitch(CoordinatorEntity, SwitchEntity):
                 )
 
 
-class DeviceOptimizationSwitch(CoordinatorEntity, SwitchEntity, RestoreEntity):
-    """Optimization enabled switch for device."""
+class _DeviceFlagSwitch(SkipUnchangedWriteMixin, CoordinatorEntity, SwitchEntity, RestoreEntity):
+    """
+    Base for switches backed by a boolean flag in the device config.
+    
+    Subclasses only declare which key they toggle and its default.
+    """
     
     _attr_has_entity_name = True
-    _attr_name = "Optimization Enabled"
+    _config_key: str
+    _default: bool
+    _label: str  # used in log messages, e.g. "Enabled optimization for ..."
+    _unique_id_suffix: str
     
     def __init__(self, coordinator: DeviceCoordinator) -> None:
         """Initialize the switch."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_optimization_enabled"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}{self._unique_id_suffix}"
         
         # Link to device
-        device_name = coordinator.device_name
-        device_type = coordinator.device_config.get(CONF_TYPE, "Unknown")
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
+        self._attr_device_info = coordinator.device_info
+        self._update_from_data()
     
     async def async_added_to_hass(self) -> None:
         """Restore state on startup."""
         await super().async_added_to_hass()
         state = await self.async_get_last_state()
-        if state and state.state not in ("unknown", "unavailable"):
+        if state and state.state not in UNAVAILABLE_STATES:
             value = state.state == "on"
-            self.coordinator.update_config(CONF_OPTIMIZATION_ENABLED, value)
-            _LOGGER.debug(f"Restored optimization enabled for {self.coordinator.device_name}: {value}")
+            self.coordinator.update_config(self._config_key, value)
+            _LOGGER.debug("Restored %s for %s: %s", self._config_key, self.coordinator.device_name, value)
     
-    @property
-    def is_on(self) -> bool:
-        """Return true if optimization is enabled."""
-        return self.coordinator.device_config.get(CONF_OPTIMIZATION_ENABLED, True)
+    def _update_from_data(self) -> None:
+        """Read the flag from the device config."""
+        self._attr_is_on = self.coordinator.device_config.get(self._config_key, self._default)
+    
+    def _written_state(self) -> tuple:
+        """Compare the flag instead of a native value."""
+        return (self._attr_is_on, self.available)
     
     async def async_turn_on(self, **kwargs: Any) -> None:
-        """Enable optimization."""
-        self.coordinator.update_config(CONF_OPTIMIZATION_ENABLED, True)
-        _LOGGER.info(f"Enabled optimization for device: {self.coordinator.device_name}")
-        self.async_write_ha_state()
+        """Set the flag."""
+        if self.is_on:
+            return  # already set, skip the log and state write
+        # update_config notifies listeners, which writes the new state
+        self.coordinator.update_config(self._config_key, True)
+        _LOGGER.info("Enabled %s for device: %s", self._label, self.coordinator.device_name)
     
     async def async_turn_off(self, **kwargs: Any) -> None:
-        """Disable optimization."""
-        self.coordinator.update_config(CONF_OPTIMIZATION_ENABLED, False)
-        _LOGGER.info(f"Disabled optimization for device: {self.coordinator.device_name}")
-        self.async_write_ha_state()
+        """Clear the flag."""
+        if not self.is_on:
+            return  # already clear, skip the log and state write
+        self.coordinator.update_config(self._config_key, False)
+        _LOGGER.info("Disabled %s for device: %s", self._label, self.coordinator.device_name)
 
 
-class DeviceSimulationSwitch(CoordinatorEntity, SwitchEntity, RestoreEntity):
+class DeviceOptimizationSwitch(_DeviceFlagSwitch):
+    """Optimization enabled switch for device."""
+    
+    _attr_name = "Optimization Enabled"
+    _config_key = CONF_OPTIMIZATION_ENABLED
+    _default = True
+    _label = "optimization"
+    _unique_id_suffix = "optimization_enabled"
+
+
+class DeviceSimulationSwitch(_DeviceFlagSwitch):
     """Simulation active switch for device."""
     
-    _attr_has_entity_name = True
     _attr_name = "Simulation Active"
-    
-    def __init__(self, coordinator: DeviceCoordinator) -> None:
-        """Initialize the switch."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_simulation_active"
-        
-        # Link to device
-        device_name = coordinator.device_name
-        device_type = coordinator.device_config.get(CONF_TYPE, "Unknown")
-        normalized_name = normalize_device_name(device_name)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{coordinator.config_entry.entry_id}_{normalized_name}")},
-        }
-    
-    async def async_added_to_hass(self) -> None:
-        """Restore state on startup."""
-        await super().async_added_to_hass()
-        state = await self.async_get_last_state()
-        if state and state.state not in ("unknown", "unavailable"):
-            value = state.state == "on"
-            self.coordinator.update_config(CONF_SIMULATION_ACTIVE, value)
-            _LOGGER.debug(f"Restored simulation active for {self.coordinator.device_name}: {value}")
-    
-    @property
-    def is_on(self) -> bool:
-        """Return true if simulation is active."""
-        return self.coordinator.device_config.get(CONF_SIMULATION_ACTIVE, False)
-    
-    async def async_turn_on(self, **kwargs: Any) -> None:
-        """Enable simulation."""
-        self.coordinator.update_config(CONF_SIMULATION_ACTIVE, True)
-        _LOGGER.info(f"Enabled simulation for device: {self.coordinator.device_name}")
-        self.async_write_ha_state()
-    
-    async def async_turn_off(self, **kwargs: Any) -> None:
-        """Disable simulation."""
-        self.coordinator.update_config(CONF_SIMULATION_ACTIVE, False)
-        _LOGGER.info(f"Disabled simulation for device: {self.coordinator.device_name}")
-        self.async_write_ha_state()
+    _config_key = CONF_SIMULATION_ACTIVE
+    _default = False
+    _label = "simulation"
+    _unique_id_suffix = "simulation_active"
@@ -5,11 +5,18 @@ import pytest
 from unittest.mock import Mock, AsyncMock, MagicMock
 from datetime import datetime, timedelta
 import zoneinfo
+from types import MappingProxyType, SimpleNamespace
 
 from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
 
 
+@pytest.fixture(scope="session")
+def frozen_now():
+    """Return a single timestamp shared by all time-based fixtures."""
+    return dt_util.now()
+
+
 @pytest.fixture
 def mock_hass():
     """Return a mocked Home Assistant instance."""
@@ -21,19 +28,19 @@ def mock_hass():
     return hass
 
 
-@pytest.fixture
-def mock_surplus_sensor_state():
+@pytest.fixture(scope="session")
+def mock_surplus_sensor_state(frozen_now):
     """Return a mocked surplus sensor state."""
-    state = Mock()
-    state.state = "-500.0"  # Negative = grid export (surplus)
-    state.last_updated = dt_util.now()
-    return state
+    return SimpleNamespace(
+        state="-500.0",  # Negative = grid export (surplus)
+        last_updated=frozen_now,
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_device_config():
-    """Return sample device configuration."""
-    return {
+    """Return sample device configuration as a read-only mapping."""
+    return MappingProxyType({
         "name": "TestDevice",
         "type": "switch",
         "power": 400,
@@ -43,13 +50,16 @@ def sample_device_config():
         "simulation_active": True,
         "min_on_time": 0,
         "min_off_time": 0,
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_device_states():
-    """Return sample device states dictionary."""
-    return {
+    """Return sample device states as a read-only mapping.
+
+    Shared across the session - tests needing a modified state build a local copy.
+    """
+    states = {
         "Device1": {
             "is_on": True,
             "power_measured": 380.0,
@@ -84,32 +94,35 @@ def sample_device_states():
             "pvo_last_target_state": True,
         },
     }
+    return MappingProxyType(
+        {name: MappingProxyType(state) for name, state in states.items()}
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_optimizer_stats():
-    """Return sample optimizer statistics."""
-    return {
+    """Return sample optimizer statistics as a read-only mapping."""
+    return MappingProxyType({
         "surplus_current": 500.0,
         "surplus_average": 480.0,
         "power_rated_total": 1330.0,  # Device1 + Device3 (both ON)
         "power_measured_total": 1330.0,
         "surplus_offset": 0.0,
-    }
+    })
 
 
-@pytest.fixture
-def sample_history_snapshot():
-    """Return sample history snapshot."""
-    return {
-        "timestamp": dt_util.now().isoformat(),
+@pytest.fixture(scope="session")
+def sample_history_snapshot(frozen_now):
+    """Return sample history snapshot as a read-only mapping."""
+    return MappingProxyType({
+        "timestamp": frozen_now.isoformat(),
         "surplus_current": 500.0,
         "surplus_average": 480.0,
         "budget_real": 480.0,
         "budget_simulation": 480.0,
         "power_measured_total": 1330.0,
-        "active_devices": [
-            {"name": "Device1", "power": 380.0},
-            {"name": "Device3", "power": 950.0},
-        ],
-    }
+        "active_devices": (
+            MappingProxyType({"name": "Device1", "power": 380.0}),
+            MappingProxyType({"name": "Device3", "power": 950.0}),
+        ),
+    })
@@ -1,102 +1,135 @@
 """Unit tests for PV Optimizer Coordinators."""
 import pytest
-from unittest.mock import Mock, AsyncMock, patch, MagicMock
-from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+from types import SimpleNamespace
 
-from custom_components.pv_optimizer.coordinators import ServiceCoordinator, DeviceCoordinator
+from custom_components.pv_optimizer.coordinators import DeviceCoordinator, ServiceCoordinator
 from custom_components.pv_optimizer.const import (
-    CONF_POWER,
-    CONF_PRIORITY,
+    CONF_DEVICE_COLOR,
+    CONF_INVERT_SURPLUS_VALUE,
     CONF_NAME,
+    CONF_PRIORITY,
+    CONF_SLIDING_WINDOW_SIZE,
+    CONF_SURPLUS_SENSOR_ENTITY_ID,
 )
 
 
+@pytest.fixture
+def service_coordinator(mock_hass):
+    """Return a ServiceCoordinator for a service entry on the mocked hass."""
+    config_entry = Mock()
+    config_entry.data = {
+        "entry_type": "service",
+        "global": {
+            CONF_SURPLUS_SENSOR_ENTITY_ID: "sensor.surplus",
+            CONF_SLIDING_WINDOW_SIZE: 5,
+        },
+    }
+    coordinator = ServiceCoordinator(mock_hass, config_entry)
+    # No recorder history and no real devices to switch in unit tests
+    coordinator._get_averaged_surplus = AsyncMock(return_value=0.0)
+    coordinator._synchronize_states = AsyncMock()
+    return coordinator
+
+
+@pytest.fixture
+def device_coordinator(mock_hass):
+    """Return a DeviceCoordinator for a device entry on the mocked hass."""
+    config_entry = Mock()
+    config_entry.entry_id = "device_entry"
+    config_entry.data = {
+        "entry_type": "device",
+        # Color already set, so construction doesn't save the config
+        "device_config": {CONF_NAME: "Heater", CONF_PRIORITY: 3, CONF_DEVICE_COLOR: "#ff9800"},
+    }
+    with patch("custom_components.pv_optimizer.coordinators.Store"):
+        return DeviceCoordinator(mock_hass, config_entry)
+
+
+@pytest.fixture
+def call_later():
+    """Patch async_call_later; every scheduled timer gets its own cancel mock."""
+    with patch(
+        "custom_components.pv_optimizer.coordinators.async_call_later",
+        side_effect=lambda *args: Mock(),
+    ) as mock_call_later:
+        yield mock_call_later
+
+
+@pytest.fixture(scope="module")
+def device_coordinators(sample_device_states):
+    """Return mocked device coordinators for the sample devices.
+
+    Built once per module - tests only read from them.
+    """
+    device_configs = {
+        "Device1": {"power": 400},
+        "Device2": {"power": 25},
+        "Device3": {"power": 950},
+    }
+    return {
+        name: SimpleNamespace(data=sample_device_states[name], device_config=config)
+        for name, config in device_configs.items()
+    }
+
+
 class TestServiceCoordinator:
     """Tests for ServiceCoordinator data transformations."""
 
     @pytest.mark.asyncio
     async def test_power_measured_total_only_counts_on_devices(
-        self, mock_hass, sample_device_states
+        self, service_coordinator, device_coordinators
     ):
         """Test that power_measured_total only counts devices that are ON."""
-        # Setup
-        config_entry = Mock()
-        config_entry.data = {
-            "entry_type": "service",
-            "global": {
-                "surplus_sensor_entity_id": "sensor.surplus",
-                "sliding_window_size": 5,
-            },
-        }
+        # Device1 and Device3 are ON
+        service_coordinator.device_coordinators = device_coordinators
         
-        coordinator = ServiceCoordinator(mock_hass, config_entry)
+        data = await service_coordinator._async_update_data()
         
-        # Mock device states (Device1 and Device3 are ON)
-        coordinator.device_coordinators = {
-            "Device1": Mock(data=sample_device_states["Device1"], device_config={"power": 400}),
-            "Device2": Mock(data=sample_device_states["Device2"], device_config={"power": 25}),
-            "Device3": Mock(data=sample_device_states["Device3"], device_config={"power": 950}),
-        }
-        
-        # Calculate expected value (only ON devices)
-        expected_measured = 380.0 + 950.0  # Device1 + Device3
-        
-        # Mock the calculation in _async_update_data
-        calculated_total = sum(
-            state.get("power_measured", 0)
-            for state in sample_device_states.values()
-            if state.get("is_on")
-        )
-        
-        assert calculated_total == expected_measured
-        assert calculated_total == 1330.0
+        assert data["optimizer_stats"]["power_measured_total"] == 380.0 + 950.0
 
     @pytest.mark.asyncio
     async def test_power_rated_total_only_counts_on_devices(
-        self, mock_hass, sample_device_states
+        self, service_coordinator, device_coordinators
     ):
         """Test that power_rated_total only counts devices that are ON."""
-        device_configs = {
-            "Device1": {"power": 400},
-            "Device2": {"power": 25},
-            "Device3": {"power": 950},
-        }
+        # Device1 and Device3 are ON
+        service_coordinator.device_coordinators = device_coordinators
         
-        # Calculate expected value (only ON devices)
-        expected_rated = 400 + 950  # Device1 + Device3
+        data = await service_coordinator._async_update_data()
         
-        # Mock the calculation
-        calculated_total = sum(
-            device_configs[name].get("power", 0)
-            for name, state in sample_device_states.items()
-            if state.get("is_on")
-        )
-        
-        assert calculated_total == expected_rated
-        assert calculated_total == 1350.0
+        assert data["optimizer_stats"]["power_rated_total"] == 400 + 950
 
-    def test_surplus_calculation(self, mock_surplus_sensor_state):
+    def test_surplus_calculation(
+        self, mock_hass, service_coordinator, mock_surplus_sensor_state
+    ):
         """Test surplus value calculation with inversion."""
-        # Test default inversion (grid export is negative, surplus is positive)
-        surplus_value = float(mock_surplus_sensor_state.state)
-        inverted_surplus = surplus_value * -1
+        mock_hass.states.get.return_value = mock_surplus_sensor_state
         
-        assert inverted_surplus == 500.0
+        # Test default inversion (grid export is negative, surplus is positive)
+        assert service_coordinator._get_current_surplus() == 500.0
         
         # Test double inversion (when invert_surplus_value is True)
-        double_inverted = inverted_surplus * -1
-        assert double_inverted == -500.0
+        service_coordinator.global_config[CONF_INVERT_SURPLUS_VALUE] = True
+        service_coordinator._update_surplus_config()
+        assert service_coordinator._get_current_surplus() == -500.0
 
     def test_device_locking_logic(self, sample_device_states):
         """Test that locked devices are excluded from optimization."""
-        # Manually lock Device1
-        sample_device_states["Device1"]["is_locked_manual"] = True
-        sample_device_states["Device1"]["is_locked"] = True
+        # Manually lock Device1 (local copy - the fixture is session-scoped)
+        device_states = {
+            **sample_device_states,
+            "Device1": {
+                **sample_device_states["Device1"],
+                "is_locked_manual": True,
+                "is_locked": True,
+            },
+        }
         
         # Filter unlocked devices
         unlocked_devices = [
-            name for name, state in sample_device_states.items()
-            if not state.get("is_locked")
+            name for name, state in device_states.items()
+            if not state["is_locked"]
         ]
         
         assert "Device1" not in unlocked_devices
@@ -107,69 +140,47 @@ class TestServiceCoordinator:
 class TestKnapsackOptimization:
     """Tests for knapsack optimization algorithm."""
 
-    def test_optimization_with_sufficient_budget(self):
-        """Test device selection when budget is sufficient."""
-        devices = [
-            {"name": "Device1", "power": 400, "priority": 5},
-            {"name": "Device2", "power": 950, "priority": 6},
-            {"name": "Device3", "power": 25, "priority": 5},
-        ]
-        budget = 1500.0
-        
-        # Sort by priority (lower number = higher priority)
-        sorted_devices = sorted(devices, key=lambda d: d["priority"])
-        
-        selected = []
-        remaining_budget = budget
-        
-        for device in sorted_devices:
-            if device["power"] <= remaining_budget:
-                selected.append(device["name"])
-                remaining_budget -= device["power"]
-        
-        assert "Device1" in selected  # Priority 5, 400W
-        assert "Device3" in selected  # Priority 5, 25W
-        assert "Device2" in selected  # Priority 6, 950W
-        assert remaining_budget == 125.0
-
-    def test_optimization_with_insufficient_budget(self):
-        """Test device selection when budget is too small."""
-        devices = [
-            {"name": "Device1", "power": 400, "priority": 5},
-            {"name": "Device2", "power": 950, "priority": 6},
-        ]
-        budget = 300.0  # Not enough for any device
-        
-        selected = []
-        for device in devices:
-            if device["power"] <= budget:
-                selected.append(device)
-        
-        assert len(selected) == 0
-
-    def test_optimization_priority_order(self):
-        """Test that devices are selected by priority first."""
-        devices = [
-            {"name": "LowPrio", "power": 100, "priority": 10},
-            {"name": "HighPrio", "power": 100, "priority": 1},
-            {"name": "MedPrio", "power": 100, "priority": 5},
-        ]
-        budget = 200.0
-        
-        sorted_devices = sorted(devices, key=lambda d: d["priority"])
-        
-        selected = []
-        remaining_budget = budget
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "devices, budget, expected_selected",
+        [
+            pytest.param(
+                [("Device1", 400, 5), ("Device2", 950, 6), ("Device3", 25, 5)],
+                1500.0,
+                ["Device1", "Device3", "Device2"],
+                id="sufficient_budget",
+            ),
+            pytest.param(
+                [("Device1", 400, 5), ("Device2", 950, 6)],
+                300.0,  # Not enough for any device
+                [],
+                id="insufficient_budget",
+            ),
+            pytest.param(
+                [("LowPrio", 100, 10), ("HighPrio", 100, 1), ("MedPrio", 100, 5)],
+                200.0,
+                ["HighPrio", "MedPrio"],  # Selected by priority first
+                id="priority_order",
+            ),
+            pytest.param(
+                [("Small", 25, 5), ("Large", 400, 5)],
+                410.0,
+                ["Large"],  # Largest device of a priority tier is tried first
+                id="largest_first_within_priority",
+            ),
+        ],
+    )
+    async def test_ideal_state_selection(
+        self, service_coordinator, devices, budget, expected_selected
+    ):
+        """Test greedy device selection by priority within the budget."""
+        service_coordinator._power_by_name = {name: power for name, power, _ in devices}
+        service_coordinator._priority_by_name = {name: prio for name, _, prio in devices}
+        device_states = [(name, {"is_on": False, "is_locked": False}) for name, _, _ in devices]
         
-        for device in sorted_devices:
-            if device["power"] <= remaining_budget:
-                selected.append(device["name"])
-                remaining_budget -= device["power"]
+        selected = await service_coordinator._calculate_ideal_state(budget, device_states)
         
-        # Should select HighPrio and MedPrio first
-        assert selected[0] == "HighPrio"
-        assert selected[1] == "MedPrio"
-        assert "LowPrio" not in selected
+        assert selected == expected_selected
 
 
 class TestDeviceCoordinator:
@@ -196,14 +207,68 @@ class TestDeviceCoordinator:
 
     def test_unavailable_device_handling(self, sample_device_states):
         """Test that unavailable devices are handled correctly."""
-        # Mark device as unavailable
-        sample_device_states["Device1"]["is_available"] = False
+        # Mark device as unavailable (local copy - the fixture is session-scoped)
+        device_states = {
+            **sample_device_states,
+            "Device1": {**sample_device_states["Device1"], "is_available": False},
+        }
         
         # Filter available devices
         available_devices = [
-            name for name, state in sample_device_states.items()
-            if state.get("is_available", True)
+            name for name, state in device_states.items()
+            if state["is_available"]
         ]
         
         assert "Device1" not in available_devices
         assert len(available_devices) == 2
+
+
+class TestDeviceConfigSave:
+    """Tests for the debounced device config write."""
+
+    def test_repeated_updates_schedule_one_save(self, device_coordinator, call_later, mock_hass):
+        """Test that each update restarts the timer, leaving one pending save."""
+        device_coordinator.update_config(CONF_PRIORITY, 4)
+        first_unsub = device_coordinator._unsub_config_save
+        device_coordinator.update_config(CONF_PRIORITY, 5)
+        
+        first_unsub.assert_called_once()
+        assert device_coordinator._unsub_config_save is not first_unsub
+        mock_hass.config_entries.async_update_entry.assert_not_called()
+        
+        # Firing the remaining timer writes the latest value once
+        save_callback = call_later.call_args.args[2]
+        save_callback(None)
+        
+        mock_hass.config_entries.async_update_entry.assert_called_once()
+        data = mock_hass.config_entries.async_update_entry.call_args.kwargs["data"]
+        assert data["device_config"][CONF_PRIORITY] == 5
+        assert device_coordinator._unsub_config_save is None
+
+    def test_unchanged_value_schedules_nothing(self, device_coordinator, call_later, mock_hass):
+        """Test that writing the current value neither schedules nor saves."""
+        device_coordinator.update_config(CONF_PRIORITY, 3)
+        
+        call_later.assert_not_called()
+        assert device_coordinator._unsub_config_save is None
+        mock_hass.config_entries.async_update_entry.assert_not_called()
+
+    def test_flush_writes_immediately(self, device_coordinator, call_later, mock_hass):
+        """Test that flushing writes the pending change and cancels the timer."""
+        device_coordinator.update_config(CONF_PRIORITY, 4)
+        unsub = device_coordinator._unsub_config_save
+        
+        device_coordinator.async_flush_config()
+        
+        unsub.assert_called_once()
+        assert device_coordinator._unsub_config_save is None
+        mock_hass.config_entries.async_update_entry.assert_called_once()
+        data = mock_hass.config_entries.async_update_entry.call_args.kwargs["data"]
+        assert data["device_config"][CONF_PRIORITY] == 4
+
+    def test_flush_without_pending_save_is_noop(self, device_coordinator, call_later, mock_hass):
+        """Test that flushing with nothing pending doesn't write the entry."""
+        device_coordinator.async_flush_config()
+        
+        call_later.assert_not_called()
+        mock_hass.config_entries.async_update_entry.assert_not_called()
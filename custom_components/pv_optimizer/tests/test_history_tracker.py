@@ -0,0 +1,79 @@
+"""Unit tests for the PV Optimizer history tracker."""
+import pytest
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.pv_optimizer.history_tracker import HistoryTracker, _snapshot_epoch
+
+
+def _snapshot(when, with_epoch=True):
+    """Return a minimal snapshot taken at the given time."""
+    snapshot = {"timestamp": when.isoformat(), "surplus_current": 0, "active_devices": []}
+    if with_epoch:
+        snapshot["ts_epoch"] = when.timestamp()
+    return snapshot
+
+
+@pytest.fixture
+def history_tracker(mock_hass):
+    """Return a HistoryTracker with a 7 day retention on the mocked hass."""
+    config_entry = Mock()
+    config_entry.entry_id = "service_entry"
+    config_entry.options = {"history_retention_days": 7}
+    with patch("custom_components.pv_optimizer.history_tracker.Store"):
+        return HistoryTracker(mock_hass, config_entry)
+
+
+class TestHistoryTracker:
+    """Tests for snapshot retention and queries."""
+
+    @pytest.mark.asyncio
+    async def test_cleanup_prunes_by_age(self, history_tracker):
+        """Test that snapshots older than the retention window are removed."""
+        now = dt_util.now()
+        history_tracker._snapshots.extend(
+            _snapshot(now - age)
+            for age in (timedelta(days=9), timedelta(days=8), timedelta(days=6), timedelta(hours=1))
+        )
+
+        await history_tracker._async_cleanup_old_data()
+
+        assert [s["timestamp"] for s in history_tracker._snapshots] == [
+            (now - timedelta(days=6)).isoformat(),
+            (now - timedelta(hours=1)).isoformat(),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_handles_snapshots_without_epoch(self, history_tracker):
+        """Test that stored snapshots with only an ISO timestamp are pruned too."""
+        now = dt_util.now()
+        old_legacy = _snapshot(now - timedelta(days=8), with_epoch=False)
+        new_legacy = _snapshot(now - timedelta(days=2), with_epoch=False)
+        new_current = _snapshot(now - timedelta(hours=1))
+        history_tracker._snapshots.extend([old_legacy, new_legacy, new_current])
+
+        await history_tracker._async_cleanup_old_data()
+
+        assert list(history_tracker._snapshots) == [new_legacy, new_current]
+        assert _snapshot_epoch(new_legacy) == pytest.approx(
+            (now - timedelta(days=2)).timestamp()
+        )
+
+    def test_get_snapshots_filters_by_hours(self, history_tracker):
+        """Test that only snapshots inside the requested window are returned."""
+        now = dt_util.now()
+        history_tracker._snapshots.extend(
+            _snapshot(now - age)
+            for age in (timedelta(hours=5), timedelta(hours=3), timedelta(hours=1), timedelta(minutes=10))
+        )
+
+        snapshots = history_tracker.get_snapshots(hours=2)
+
+        assert isinstance(snapshots, list)
+        assert [s["timestamp"] for s in snapshots] == [
+            (now - timedelta(hours=1)).isoformat(),
+            (now - timedelta(minutes=10)).isoformat(),
+        ]
+        assert len(history_tracker.get_snapshots(hours=24)) == 4